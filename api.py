@@ -0,0 +1,284 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+import datetime
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+
+import dashboard
+import database
+import data_store
+import prerender
+import trending
+
+# Alamat default service (bisa diubah lewat environment atau argumen command line)
+API_HOST = os.environ.get("COFFEE_API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("COFFEE_API_PORT", 8502))
+# Versi data dicek ulang paling cepat tiap sekian detik (polling di antaranya tidak menyentuh database)
+VERSION_TTL_SECONDS = float(os.environ.get("COFFEE_API_VERSION_TTL", 5))
+
+# Cache Streamlit (st.cache_*) tidak aktif di luar runtime Streamlit, jadi memori
+# tidak bisa dibagi dengan proses dashboard. Yang dibagi adalah cache di disk:
+# periode default dijawab dari file pre-render, dan dataset dibuka dari snapshot
+# Arrow yang sama. Dataset, period store dan cache hasil untuk permintaan lain
+# disimpan per versi data di proses ini.
+_state = {
+    'latest': None,
+    'checked_at': 0.0,
+    'df': None,
+    'period_store': None,
+    'prerender': (None, None),
+    'results': dashboard.new_figure_cache(),
+    'lock': threading.Lock()
+}
+
+# Fungsi untuk membaca versi data terbaru (dengan TTL singkat)
+def current_version():
+    """
+    Sama seperti dashboard: versi dari tabel data_version (atau fingerprint
+    fact_sales) ditambah susunan kolom dataset. Jika database tidak dapat
+    dihubungi, dipakai versi terakhir yang diketahui atau snapshot lokal.
+    """
+    now = time.monotonic()
+    if _state['latest'] is not None and now - _state['checked_at'] < VERSION_TTL_SECONDS:
+        return _state['latest']
+
+    try:
+        version = dashboard.get_data_version()
+    except Exception:
+        version = None
+    _state['checked_at'] = now
+    if version is not None:
+        _state['latest'] = dashboard.get_snapshot_key(version)
+    elif _state['latest'] is None:
+        _state['latest'] = data_store.current_version()
+    return _state['latest']
+
+# Fungsi untuk mendapatkan dataset dan period store versi terbaru
+def get_dataset():
+    """
+    Mengembalikan (dataset, period store) untuk versi data terbaru. Dataset
+    dibuka dari snapshot Arrow yang sama dengan dashboard (dipetakan ke
+    memori), dan hanya dimuat ulang jika versi data berubah.
+    """
+    version = current_version()
+    if version is None:
+        raise LookupError("Versi data tidak tersedia (database tidak dapat dihubungi dan belum ada snapshot)")
+
+    with _state['lock']:
+        if _state['df'] is None or _state['df'].attrs.get('snapshot_version') != version:
+            engine = None if data_store.has_snapshot(version) else database.get_engine()
+            df = dashboard.open_dataset(version, engine)
+            _state.update({
+                'df': df,
+                'period_store': dashboard.build_period_store(df),
+                'results': dashboard.new_figure_cache()
+            })
+        return _state['df'], _state['period_store']
+
+# Fungsi untuk mengambil hasil pre-render sebuah periode default (None jika tidak ada)
+def get_prerendered(selected_year, selected_month, comparison, filters):
+    """
+    Hasil pre-render (dibuat setelah load ETL, lihat prerender.py) hanya
+    berlaku untuk periode default tanpa filter lanjutan dan dengan pembanding
+    periode sebelumnya. Permintaan seperti itu dijawab tanpa membuka dataset.
+    """
+    if comparison != dashboard.COMPARISON_PREVIOUS or dashboard.get_filter_key(filters):
+        return None
+    version = current_version()
+    if version is None:
+        return None
+
+    with _state['lock']:
+        loaded_version, periods = _state['prerender']
+        if loaded_version != version or periods is None:
+            # File pre-render bisa muncul belakangan, jadi hasil None tidak diingat
+            periods = prerender.load_prerender(version)
+            _state['prerender'] = (version, periods)
+    return periods.get(prerender.period_key(selected_year, selected_month)) if periods else None
+
+# Fungsi untuk membaca parameter periode dan filter dari query string
+def parse_params(query):
+    """
+    Parameter: year (default All Time), month (nama bulan, mis. March),
+    comparison (previous / last_year), start & end (YYYY-MM-DD, inklusif),
+    serta store_location, product_category, product_detail (boleh diulang
+    atau dipisah koma).
+    """
+    params = parse_qs(query)
+
+    def first(name, default=None):
+        return params.get(name, [default])[0]
+
+    selected_year = first('year', "All Time")
+    selected_month = first('month')
+    if selected_year != "All Time" and not selected_year.isdigit():
+        raise ValueError(f"Tahun tidak valid: {selected_year}")
+    if selected_month is not None and selected_month != "All Months" and selected_month not in dashboard.MONTH_MAPPING:
+        raise ValueError(f"Bulan tidak valid: {selected_month}")
+
+    comparison = first('comparison', dashboard.COMPARISON_PREVIOUS)
+    if comparison not in (dashboard.COMPARISON_PREVIOUS, dashboard.COMPARISON_LAST_YEAR):
+        raise ValueError(f"Pembanding tidak valid: {comparison}")
+
+    filters = {'date_range': None}
+    if first('start') or first('end'):
+        try:
+            start = datetime.date.fromisoformat(first('start', "1900-01-01"))
+            end = datetime.date.fromisoformat(first('end', "2999-12-31"))
+        except ValueError:
+            raise ValueError("start/end harus berformat YYYY-MM-DD")
+        filters['date_range'] = (start, end)
+    for col in dashboard.FILTER_COLUMNS:
+        filters[col] = [value for raw in params.get(col, []) for value in raw.split(",") if value]
+
+    return selected_year, selected_month, comparison, filters
+
+# Fungsi untuk menghitung KPI sebuah periode (hasil di-cache per versi data)
+def get_kpis(selected_year, selected_month, comparison, filters):
+    prerendered = get_prerendered(selected_year, selected_month, comparison, filters)
+    if prerendered is not None:
+        return prerendered['kpis']
+
+    df, period_store = get_dataset()
+    key = ('kpis', selected_year, selected_month, comparison, dashboard.get_filter_key(filters), df.attrs['snapshot_version'])
+
+    def build():
+        df_filtered, df_previous = dashboard.filter_data_by_period(df, selected_year, selected_month, filters, comparison)
+        if df_filtered is None:
+            df_filtered = df.iloc[0:0]
+        return dashboard.compute_kpis(df_filtered, df_previous, selected_year, selected_month, filters, comparison, period_store)
+
+    return dashboard.get_cached_chart(key, build, _state['results'])
+
+# Fungsi untuk menghitung data sebuah chart (hasil di-cache per versi data)
+def get_chart(chart_id, selected_year, selected_month, filters):
+    if chart_id not in dashboard.CHARTS:
+        raise KeyError(chart_id)
+
+    prerendered = get_prerendered(selected_year, selected_month, dashboard.COMPARISON_PREVIOUS, filters)
+    if prerendered is not None and chart_id in prerendered['data']:
+        return prerendered['data'][chart_id]
+
+    df, _ = get_dataset()
+    key = ('data', chart_id, selected_year, selected_month, dashboard.get_filter_key(filters), df.attrs['snapshot_version'])
+
+    def build():
+        df_filtered, _ = dashboard.filter_data_by_period(df, selected_year, selected_month, filters)
+        if df_filtered is None or df_filtered.empty:
+            return pd.DataFrame()
+        return dashboard.get_chart_data(chart_id, df_filtered, selected_year, selected_month, filters=filters)
+
+    return dashboard.get_cached_chart(key, build, _state['results'])
+
+# Fungsi untuk menghitung momentum menu (hasil di-cache per hari acuan dan versi data)
+def get_trending(selected_year, selected_month, filters, window):
+    df, _ = get_dataset()
+    return dashboard.get_trending_momentum(df, selected_year, selected_month, filters, window, df.attrs['snapshot_version'], _state['results'])
+
+# Fungsi untuk mengubah nilai numpy/pandas menjadi tipe JSON
+def _to_json(value):
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime.date)):
+        return value.isoformat()
+    return str(value)
+
+# Handler HTTP untuk endpoint JSON
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "CoffeeAnalyticsAPI/1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+
+        try:
+            if parts == ['api', 'health']:
+                return self.send_json(200, {'status': 'ok', 'pool': database.pool_metrics()})
+            if parts == ['api', 'charts']:
+                return self.send_json(200, {'charts': list(dashboard.CHARTS)})
+
+            version = current_version()
+            if version is None:
+                return self.send_json(503, {'error': "Versi data tidak tersedia"})
+
+            # ETag = versi data + URL, sehingga polling dengan If-None-Match
+            # dijawab 304 tanpa menghitung apa pun selama data belum berubah
+            etag = '"' + hashlib.sha1(f"{version}|{self.path}".encode("utf-8")).hexdigest()[:20] + '"'
+            if etag in [tag.strip() for tag in self.headers.get('If-None-Match', "").split(",")]:
+                return self.send_json(304, None, etag)
+
+            if parts == ['api', 'version']:
+                return self.send_json(200, {'version': version}, etag)
+
+            selected_year, selected_month, comparison, filters = parse_params(url.query)
+            if parts == ['api', 'kpis']:
+                kpis = get_kpis(selected_year, selected_month, comparison, filters)
+                return self.send_json(200, {'version': version, 'kpis': kpis}, etag)
+            if parts == ['api', 'trending']:
+                window = parse_qs(url.query).get('window', [str(trending.DEFAULT_WINDOW_DAYS)])[0]
+                if not window.isdigit() or int(window) < 1:
+                    raise ValueError(f"Jendela tidak valid: {window}")
+                day, momentum = get_trending(selected_year, selected_month, filters, int(window))
+                records = json.loads(momentum.to_json(orient='records'))
+                return self.send_json(200, {'version': version, 'day': None if day is None else str(day), 'window': int(window), 'items': records}, etag)
+            if len(parts) == 3 and parts[:2] == ['api', 'charts']:
+                data = get_chart(parts[2], selected_year, selected_month, filters)
+                records = json.loads(data.to_json(orient='records', date_format='iso'))
+                return self.send_json(200, {'version': version, 'chart': parts[2], 'data': records}, etag)
+
+            return self.send_json(404, {'error': f"Endpoint tidak dikenal: {url.path}"})
+        except KeyError as e:
+            return self.send_json(404, {'error': f"Chart tidak dikenal: {e}"})
+        except LookupError as e:
+            return self.send_json(503, {'error': str(e)})
+        except ValueError as e:
+            return self.send_json(400, {'error': str(e)})
+        except Exception as e:
+            return self.send_json(500, {'error': str(e)})
+
+    def send_json(self, status, payload, etag=None):
+        body = b"" if payload is None else json.dumps(payload, default=_to_json).encode("utf-8")
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if payload is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Log akses ringkas ke stderr (format bawaan BaseHTTPRequestHandler)
+        if os.environ.get("COFFEE_API_QUIET") != "1":
+            super().log_message(format, *args)
+
+# Fungsi untuk membuat server HTTP (dipisah dari main agar bisa dipakai dari skrip lain)
+def create_server(host=API_HOST, port=API_PORT):
+    return ThreadingHTTPServer((host, port), ApiHandler)
+
+# Fungsi utama: menjalankan service JSON headless
+def main():
+    parser = argparse.ArgumentParser(description="Service JSON KPI & data chart Coffee Analytics")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port)
+    print(f"Coffee Analytics API berjalan di http://{args.host}:{args.port}/api/kpis")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Kolom hasil analisis afinitas produk
+RULE_COLUMNS = ['antecedent', 'consequent', 'transactions', 'support', 'confidence', 'lift']
+
+# Fungsi untuk membangun matriks transaksi x produk (sparse, biner)
+def build_basket_matrix(df):
+    """
+    Mengembalikan (matriks CSR transaksi x produk, daftar produk). Nilai
+    matriks 1 jika produk ada di transaksi tersebut (qty tidak dihitung),
+    sehingga X.T @ X berisi jumlah transaksi yang memuat setiap pasangan
+    produk dan diagonalnya jumlah transaksi per produk.
+    """
+    products = df['product_detail'].cat.categories
+    product_codes = df['product_detail'].cat.codes.to_numpy()
+    valid = product_codes >= 0
+    transaction_codes, transactions = pd.factorize(df['transaction_id'].to_numpy()[valid])
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(transaction_codes), dtype=np.int32), (transaction_codes, product_codes[valid].astype(np.int64))),
+        shape=(len(transactions), len(products))
+    )
+    # Produk yang muncul di beberapa baris satu transaksi tetap dihitung sekali
+    matrix.data[:] = 1
+    return matrix, products
+
+# Fungsi untuk menghitung aturan asosiasi antar pasangan produk
+def product_affinity(df, min_transactions=5):
+    """
+    Menghitung support, confidence dan lift untuk setiap pasangan produk yang
+    dibeli bersama di minimal min_transactions transaksi. Semua pasangan
+    dihitung sekaligus dari perkalian matriks sparse X.T @ X (produk x
+    produk), tanpa loop pasangan di Python. Setiap pasangan menghasilkan dua
+    aturan (A -> B dan B -> A); hasil diurutkan berdasarkan lift.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=RULE_COLUMNS)
+
+    matrix, products = build_basket_matrix(df)
+    n_transactions = matrix.shape[0]
+    co_occurrence = (matrix.T @ matrix).tocsr()
+    item_counts = co_occurrence.diagonal().astype(np.float64)
+
+    # Hanya segitiga atas (pasangan unik, tanpa diagonal) di atas ambang
+    pairs = sparse.triu(co_occurrence, k=1).tocoo()
+    keep = pairs.data >= max(min_transactions, 1)
+    left, right, together = pairs.row[keep], pairs.col[keep], pairs.data[keep].astype(np.float64)
+    if len(together) == 0:
+        return pd.DataFrame(columns=RULE_COLUMNS)
+
+    antecedent = np.concatenate([left, right])
+    consequent = np.concatenate([right, left])
+    together = np.concatenate([together, together])
+
+    support = together / n_transactions
+    confidence = together / item_counts[antecedent]
+    lift = confidence / (item_counts[consequent] / n_transactions)
+
+    rules = pd.DataFrame({
+        'antecedent': np.asarray(products)[antecedent],
+        'consequent': np.asarray(products)[consequent],
+        'transactions': together.astype(np.int64),
+        'support': support,
+        'confidence': confidence,
+        'lift': lift
+    })
+    return rules.sort_values(['lift', 'transactions'], ascending=False, ignore_index=True)
+
+# Fungsi untuk meringkas aturan menjadi pasangan unik (untuk chart)
+def top_pairs(rules, n=10):
+    if rules.empty:
+        return rules
+    pair = np.where(rules['antecedent'] < rules['consequent'],
+                    rules['antecedent'] + " + " + rules['consequent'],
+                    rules['consequent'] + " + " + rules['antecedent'])
+    return rules.assign(pair=pair).drop_duplicates('pair').head(n)
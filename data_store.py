@@ -0,0 +1,162 @@
+import os
+import json
+import glob
+import tempfile
+import threading
+import pyarrow as pa
+import pyarrow.ipc
+
+# Lokasi penyimpanan snapshot dataset dashboard (bisa diubah lewat environment)
+STORE_DIR = os.environ.get(
+    "COFFEE_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data_store")
+)
+CURRENT_FILE = "CURRENT"
+ATTRS_METADATA_KEY = b"coffee.attrs"
+KEEP_VERSIONS = 2
+# Naikkan jika susunan kolom dataset berubah agar snapshot lama tidak dipakai
+SNAPSHOT_FORMAT = 1
+
+_build_locks = {}
+_build_locks_lock = threading.Lock()
+
+# Fungsi untuk mendapatkan path file snapshot dari sebuah versi data
+def snapshot_path(version, store_dir=STORE_DIR):
+    safe_version = str(version).replace(os.sep, "_").replace(":", "_")
+    return os.path.join(store_dir, f"dataset-f{SNAPSHOT_FORMAT}-{safe_version}.arrow")
+
+# Fungsi untuk mengecek apakah snapshot sebuah versi sudah tersedia di disk
+def has_snapshot(version, store_dir=STORE_DIR):
+    return version is not None and os.path.exists(snapshot_path(version, store_dir))
+
+# Fungsi untuk menulis file secara atomik (tulis ke file sementara lalu os.replace)
+def _atomic_write(path, write_fn):
+    # File sementara unik per penulis: thread dan proses yang menulis file yang
+    # sama tidak pernah berbagi (atau saling menghapus) file sementara
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".tmp-")
+    os.close(fd)
+    try:
+        write_fn(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+# Fungsi untuk mendapatkan lock pembangunan sebuah artefak (mis. snapshot versi tertentu)
+def build_lock(key):
+    """
+    Satu lock per kunci per proses, sehingga artefak yang sama (snapshot,
+    traffic cube) hanya dibangun oleh satu thread; thread lain menunggu lalu
+    memakai hasilnya. Antar proses penulisan tetap aman karena setiap penulis
+    memakai file sementara sendiri dan os.replace bersifat atomik.
+    """
+    with _build_locks_lock:
+        return _build_locks.setdefault(key, threading.Lock())
+
+# Fungsi untuk membaca versi yang sedang aktif di store
+def current_version(store_dir=STORE_DIR):
+    """
+    Mengembalikan versi snapshot terakhir yang ditulis, atau None jika belum
+    ada snapshot (atau snapshot tersebut dibuat dengan format lama). Snapshot
+    tetap ada di disk setelah server restart, sehingga cold start bisa
+    langsung memakainya.
+    """
+    try:
+        with open(os.path.join(store_dir, CURRENT_FILE), "r", encoding="utf-8") as f:
+            version = f.read().strip() or None
+    except OSError:
+        return None
+    return version if has_snapshot(version, store_dir) else None
+
+# Fungsi untuk menyimpan dataset sebagai snapshot Arrow IPC
+def write_snapshot(df, version, store_dir=STORE_DIR):
+    """
+    Menyimpan DataFrame sebagai file Arrow IPC untuk versi data tertentu lalu
+    memindahkan penunjuk CURRENT ke versi tersebut. Kolom kategori disimpan
+    sebagai dictionary array, dan df.attrs ikut disimpan di metadata schema.
+    File tiap versi tidak pernah ditimpa, sehingga proses yang masih
+    memetakan versi lama tetap aman.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[ATTRS_METADATA_KEY] = json.dumps(df.attrs, default=str).encode("utf-8")
+    table = table.replace_schema_metadata(metadata)
+
+    def write_table(path):
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    path = snapshot_path(version, store_dir)
+    _atomic_write(path, write_table)
+
+    def write_pointer(pointer_path):
+        with open(pointer_path, "w", encoding="utf-8") as f:
+            f.write(str(version))
+
+    _atomic_write(os.path.join(store_dir, CURRENT_FILE), write_pointer)
+    cleanup_snapshots(store_dir)
+
+    return path
+
+# Fungsi untuk membuka snapshot sebuah versi, membangunnya dulu jika belum ada
+def ensure_snapshot(version, build, store_dir=STORE_DIR):
+    """
+    build() dipanggil paling banyak sekali per versi dalam satu proses
+    walaupun banyak thread (sesi dashboard, refresh latar belakang, job
+    setelah ETL) meminta versi yang sama bersamaan. Mengembalikan DataFrame
+    hasil open_snapshot.
+    """
+    df = open_snapshot(version, store_dir)
+    if df is not None:
+        return df
+
+    with build_lock(("snapshot", store_dir, version)):
+        if not has_snapshot(version, store_dir):
+            write_snapshot(build(), version, store_dir)
+    return open_snapshot(version, store_dir)
+
+# Fungsi untuk membuka snapshot sebagai Arrow Table yang dipetakan ke memori
+def open_table(version, store_dir=STORE_DIR):
+    path = snapshot_path(version, store_dir)
+    if not os.path.exists(path):
+        return None
+
+    source = pa.memory_map(path, "r")
+    return pa.ipc.open_file(source).read_all()
+
+# Fungsi untuk membuka snapshot sebagai DataFrame yang dipetakan ke memori
+def open_snapshot(version, store_dir=STORE_DIR):
+    """
+    Membuka snapshot versi tertentu lewat memory map. Kolom numerik, tanggal
+    dan kode kategori langsung menunjuk ke halaman file (zero-copy, read-only),
+    sehingga semua sesi dan proses yang membuka versi yang sama berbagi page
+    cache yang sama. Mengembalikan None jika snapshot belum ada.
+    """
+    table = open_table(version, store_dir)
+    if table is None:
+        return None
+
+    df = table.to_pandas(split_blocks=True)
+
+    raw_attrs = (table.schema.metadata or {}).get(ATTRS_METADATA_KEY)
+    if raw_attrs:
+        df.attrs.update(json.loads(raw_attrs.decode("utf-8")))
+
+    return df
+
+# Fungsi untuk menghapus snapshot lama
+def cleanup_snapshots(store_dir=STORE_DIR, keep=KEEP_VERSIONS):
+    snapshots = sorted(
+        glob.glob(os.path.join(store_dir, "dataset-*.arrow")),
+        key=os.path.getmtime,
+        reverse=True
+    )
+    for path in snapshots[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            # Snapshot mungkin masih dipetakan oleh proses lain (mis. di Windows)
+            pass
@@ -0,0 +1,67 @@
+from sqlalchemy import text
+
+# Jenis perubahan data yang dilaporkan ETL
+CHANGE_APPEND = "append"
+CHANGE_FULL = "full"
+
+# Fungsi untuk membuat tabel data_version jika belum ada
+def ensure_table(conn):
+    """
+    Tabel satu baris (id = 1) yang dinaikkan versinya setiap kali ETL selesai
+    commit. last_full_version mencatat versi terakhir yang bukan sekadar
+    penambahan baris, sehingga cache bisa tahu apakah boleh refresh secara
+    incremental. Jalankan di luar transaksi load karena DDL di MySQL memicu
+    implicit commit.
+    """
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INT PRIMARY KEY,
+            version BIGINT NOT NULL,
+            last_full_version BIGINT NOT NULL,
+            change_kind VARCHAR(16) NOT NULL,
+            rows_loaded INT NOT NULL,
+            updated_at DATETIME NOT NULL
+        )
+    """))
+
+# Fungsi untuk menaikkan versi data (dipanggil di dalam transaksi load)
+def bump_version(conn, change_kind, rows_loaded):
+    result = conn.execute(text("""
+        UPDATE data_version
+        SET last_full_version = CASE WHEN :change_kind = 'append' THEN last_full_version ELSE version + 1 END,
+            version = version + 1,
+            change_kind = :change_kind,
+            rows_loaded = :rows_loaded,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = 1
+    """), {'change_kind': change_kind, 'rows_loaded': rows_loaded})
+
+    if result.rowcount == 0:
+        conn.execute(text("""
+            INSERT INTO data_version (id, version, last_full_version, change_kind, rows_loaded, updated_at)
+            VALUES (1, 1, 1, :change_kind, :rows_loaded, CURRENT_TIMESTAMP)
+        """), {'change_kind': change_kind, 'rows_loaded': rows_loaded})
+
+# Fungsi untuk membaca versi data saat ini (lookup primary key, murah dicek tiap rerun)
+def read_version(conn):
+    """
+    Mengembalikan dict {'version', 'last_full_version', 'change_kind'} atau None
+    jika tabel data_version belum ada / belum pernah diisi oleh ETL.
+    """
+    try:
+        row = conn.execute(text(
+            "SELECT version, last_full_version, change_kind FROM data_version WHERE id = 1"
+        )).fetchone()
+    except Exception:
+        conn.rollback()
+        return None
+
+    if row is None:
+        return None
+    return {'version': int(row[0]), 'last_full_version': int(row[1]), 'change_kind': row[2]}
+
+# Fungsi untuk mengecek apakah data sejak versi tertentu hanya bertambah baris
+def is_append_since(version_info, since_version):
+    if version_info is None or since_version is None:
+        return False
+    return int(since_version) >= version_info['last_full_version']
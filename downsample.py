@@ -0,0 +1,41 @@
+import math
+import numpy as np
+
+# Fungsi untuk memilih titik representatif deret waktu dengan LTTB
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets: mengembalikan posisi (indeks) maksimal
+    threshold titik yang mempertahankan bentuk deret (puncak dan lembah
+    tetap ada). Titik pertama dan terakhir selalu diambil. x harus numerik
+    dan terurut naik.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    a = 0
+
+    for i in range(threshold - 2):
+        # Rata-rata bucket berikutnya sebagai titik ketiga segitiga
+        next_start = int(math.floor((i + 1) * every)) + 1
+        next_end = min(int(math.floor((i + 2) * every)) + 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Pilih titik di bucket sekarang dengan luas segitiga terbesar
+        start = int(math.floor(i * every)) + 1
+        end = int(math.floor((i + 1) * every)) + 1
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+
+    selected[-1] = n - 1
+    return selected
@@ -0,0 +1,124 @@
+import os
+import glob
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import text
+
+import data_store
+import sql_reader
+
+# Lokasi file hasil export (bisa diubah lewat environment)
+EXPORT_DIR = os.environ.get(
+    "COFFEE_EXPORT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports")
+)
+# File export yang lebih tua dari ini dihapus saat export baru dibuat
+EXPORT_MAX_AGE_HOURS = 24
+FORMATS = {'csv': 'text/csv', 'parquet': 'application/octet-stream'}
+
+# Tipe Arrow untuk setiap tipe kolom sql_reader (skema Parquet tetap sama di semua chunk)
+ARROW_TYPES = {
+    'category': pa.string(),
+    'datetime': pa.timestamp('ns'),
+    'float': pa.float64(),
+    'int64': pa.int64(),
+    'Int8': pa.int8(),
+    'Int16': pa.int16(),
+    'Int32': pa.int32(),
+    'Int64': pa.int64()
+}
+
+# Fungsi untuk membaca hasil query per chunk (server-side cursor)
+def iter_query_chunks(conn, query, params=None, column_kinds=None, chunk_size=sql_reader.DEFAULT_CHUNK_SIZE):
+    """
+    Menghasilkan DataFrame per chunk dari hasil query yang dibaca dengan
+    stream_results, sehingga hanya satu chunk yang berada di memori. Kolom
+    dikonversi sesuai column_kinds (lihat sql_reader) agar tipe setiap chunk
+    sama.
+    """
+    column_kinds = column_kinds or {}
+    result = conn.execution_options(stream_results=True).execute(text(query), params or {})
+    columns = list(result.keys())
+
+    try:
+        for chunk in result.partitions(chunk_size):
+            df = pd.DataFrame.from_records(chunk, columns=columns)
+            for col in columns:
+                kind = column_kinds.get(col)
+                if kind == 'category':
+                    df[col] = df[col].astype('string')
+                elif kind == 'datetime':
+                    df[col] = pd.to_datetime(df[col], errors='coerce')
+                elif kind is not None:
+                    numeric = pd.to_numeric(df[col], errors='coerce')
+                    df[col] = numeric.astype('float64' if kind == 'float' else kind.capitalize())
+            yield df
+    finally:
+        result.close()
+
+# Fungsi untuk memotong DataFrame yang sudah ada (mis. hasil agregasi chart) menjadi chunk
+def iter_frame_chunks(df, chunk_size=sql_reader.DEFAULT_CHUNK_SIZE):
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+# Fungsi untuk membuat skema Arrow dari tipe kolom sql_reader
+def arrow_schema(column_kinds):
+    return pa.schema([(col, ARROW_TYPES.get(kind, pa.float64())) for col, kind in column_kinds.items()])
+
+# Fungsi untuk menulis chunk ke file CSV atau Parquet
+def write_export(chunks, path, fmt, schema=None, progress=None):
+    """
+    Menulis chunk satu per satu ke file (CSV: header hanya di chunk pertama;
+    Parquet: satu row group per chunk), sehingga memori yang dipakai tetap
+    sebesar satu chunk berapa pun jumlah barisnya. File ditulis ke file
+    sementara lalu dipindahkan, jadi file yang belum selesai tidak pernah
+    terlihat. progress (dict, opsional) diisi jumlah baris yang sudah ditulis.
+    Mengembalikan jumlah baris.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Format export tidak dikenal: {fmt}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rows = 0
+
+    def write_file(tmp_path):
+        nonlocal rows
+        with open(tmp_path, "wb") as f:
+            writer = None
+            try:
+                for chunk in chunks:
+                    if fmt == 'csv':
+                        f.write(chunk.to_csv(index=False, header=rows == 0).encode("utf-8"))
+                    else:
+                        table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                        if writer is None:
+                            writer = pq.ParquetWriter(f, table.schema)
+                        writer.write_table(table)
+                    rows += len(chunk)
+                    if progress is not None:
+                        progress['rows'] = rows
+                if writer is None and fmt == 'parquet':
+                    # Tidak ada baris: tetap tulis file Parquet kosong dengan skema
+                    pq.write_table((schema or pa.schema([])).empty_table(), f)
+            finally:
+                if writer is not None:
+                    writer.close()
+
+    data_store._atomic_write(path, write_file)
+    return rows
+
+# Fungsi untuk membuat path file export baru
+def new_export_path(name, fmt, export_dir=EXPORT_DIR):
+    safe_name = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in str(name))
+    return os.path.join(export_dir, f"{safe_name}-{time.strftime('%Y%m%d-%H%M%S')}.{fmt}")
+
+# Fungsi untuk menghapus file export lama
+def cleanup_exports(export_dir=EXPORT_DIR, max_age_hours=EXPORT_MAX_AGE_HOURS):
+    cutoff = time.time() - max_age_hours * 3600
+    for path in glob.glob(os.path.join(export_dir, "*")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
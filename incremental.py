@@ -0,0 +1,58 @@
+import pandas as pd
+from pandas.api.types import union_categoricals
+from sqlalchemy import text
+
+# Fungsi untuk membaca watermark fact_sales (jumlah baris dan transaction_id terbesar)
+def fact_sales_watermark(conn):
+    row = conn.execute(text(
+        "SELECT COUNT(*), COALESCE(MAX(transaction_id), 0) FROM fact_sales"
+    )).fetchone()
+    return {'rows': int(row[0]), 'max_transaction_id': int(row[1])}
+
+# Fungsi untuk mengecek apakah perubahan sejak watermark hanya berupa penambahan baris
+def is_append_only(conn, watermark):
+    """
+    Perubahan dianggap append-only jika semua baris baru berada di atas
+    transaction_id watermark dan jumlah baris lama tidak berubah. Delete atau
+    baris baru dengan transaction_id lama membuat jumlahnya tidak cocok
+    sehingga pemanggil melakukan full reload. Update di tempat tidak mengubah
+    jumlah baris maupun transaction_id terbesar, sehingga tidak terdeteksi di
+    sini; karena itu ETL juga menaikkan counter data_version, dan cek ini
+    hanya dipakai jika tabel tersebut belum ada.
+    """
+    if not watermark:
+        return False
+
+    current = fact_sales_watermark(conn)
+    if current['rows'] < watermark['rows']:
+        return False
+
+    new_rows = conn.execute(
+        text("SELECT COUNT(*) FROM fact_sales WHERE transaction_id > :watermark"),
+        {'watermark': watermark['max_transaction_id']}
+    ).scalar()
+    return current['rows'] - watermark['rows'] == int(new_rows)
+
+# Fungsi untuk menggabungkan dataset lama dengan baris baru
+def append_rows(base, delta):
+    """
+    Menggabungkan baris baru ke dataset yang sudah di-cache. Kolom kategori
+    digabung dengan union_categoricals agar tetap categorical (pd.concat biasa
+    akan mengubahnya menjadi object jika kategorinya berbeda).
+    """
+    if delta is None or delta.empty:
+        return base
+    if base is None or base.empty:
+        return delta
+
+    columns = {}
+    for col in base.columns:
+        if isinstance(base[col].dtype, pd.CategoricalDtype) and isinstance(delta[col].dtype, pd.CategoricalDtype):
+            columns[col] = union_categoricals([base[col], delta[col]], ignore_order=True)
+        else:
+            columns[col] = pd.concat([base[col], delta[col]], ignore_index=True)
+
+    # Kolom hasil concat sudah berupa salinan baru, tidak perlu disalin lagi saat membuat DataFrame
+    df = pd.DataFrame(columns, copy=False)
+    df.attrs.update(base.attrs)
+    return df
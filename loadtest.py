@@ -0,0 +1,499 @@
+"""
+Load test dashboard Coffee Analytics tanpa browser.
+
+Setiap sesi simulasi adalah AppTest Streamlit yang menjalankan main.py dengan
+cache bersama satu proses (sama seperti satu server `streamlit run`), lalu
+berpindah halaman dan mengganti filter seperti analis sungguhan. Database
+SQLite lokal diisi data sintetis, dan (opsional) load ETL berjalan berkala di
+latar belakang lewat preprocess_data dan load_to_mysql yang sama dengan
+halaman ETL.
+
+Contoh:
+    python loadtest.py --rows 200000 --sessions 1,2,4,8 --actions 6 --etl-interval 20
+"""
+import os
+import sys
+import time
+import uuid
+import json
+import random
+import argparse
+import contextlib
+import importlib.util
+import datetime
+import threading
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, event
+
+try:
+    import resource
+except ImportError:
+    # Modul resource tidak ada di Windows; peak RSS tidak dilaporkan
+    resource = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WORK_DIR = os.path.join(BASE_DIR, ".loadtest")
+
+STORES = [(3, "Astoria"), (5, "Lower Manhattan"), (8, "Hell's Kitchen")]
+# (kategori, tipe, produk, size, harga)
+PRODUCTS = [
+    ("Coffee", "Barista Espresso", "Americano", "Regular", 3.0),
+    ("Coffee", "Barista Espresso", "Cappuccino", "Regular", 3.75),
+    ("Coffee", "Barista Espresso", "Latte", "Large", 4.25),
+    ("Coffee", "Gourmet brewed coffee", "Es Kopi Susu", "Regular", 3.5),
+    ("Coffee", "Gourmet brewed coffee", "Brown Sugar Latte", "Large", 4.5),
+    ("Tea", "Brewed Chai tea", "Chai", "Regular", 3.0),
+    ("Tea", "Brewed herbal tea", "Lemon Tea", "Regular", 2.5),
+    ("Tea", "Brewed Green tea", "Matcha Latte", "Large", 4.75),
+    ("Drinking Chocolate", "Hot chocolate", "Cocoa", "Regular", 3.5),
+    ("Bakery", "Pastry", "Croissant", "Not Defined", 3.5),
+    ("Bakery", "Scone", "Scone", "Not Defined", 3.25),
+    ("Bakery", "Pastry", "Cheesecake", "Not Defined", 4.0),
+    ("Food", "Sandwich", "Club Sandwich", "Not Defined", 6.5),
+    ("Food", "Salad", "Caesar Salad", "Not Defined", 6.0)
+]
+# Bobot jam buka 06:00 - 20:00 (ramai pagi dan siang)
+HOUR_WEIGHTS = np.array([3, 8, 10, 10, 8, 6, 6, 5, 5, 4, 4, 3, 3, 2, 1], dtype=np.float64)
+
+# Fungsi untuk membuat data transaksi sintetis dalam format CSV yang diterima halaman ETL
+def generate_sales(n_rows, start_date, days, seed=0, first_transaction_id=1):
+    rng = np.random.default_rng(seed)
+
+    # Satu transaksi berisi 1-3 item
+    basket_sizes = rng.choice([1, 2, 3], size=n_rows, p=[0.5, 0.35, 0.15])
+    basket_sizes = basket_sizes[:np.searchsorted(np.cumsum(basket_sizes), n_rows) + 1]
+    transaction_ids = np.repeat(np.arange(first_transaction_id, first_transaction_id + len(basket_sizes)), basket_sizes)[:n_rows]
+    n_transactions = len(basket_sizes)
+
+    day_offsets = rng.integers(0, days, n_transactions)
+    hours = 6 + rng.choice(len(HOUR_WEIGHTS), size=n_transactions, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+    minutes = rng.integers(0, 60, n_transactions)
+    store_idx = rng.integers(0, len(STORES), n_transactions)
+    line_transaction = transaction_ids - first_transaction_id
+
+    timestamps = (
+        pd.Timestamp(start_date)
+        + pd.to_timedelta(day_offsets[line_transaction], unit='D')
+        + pd.to_timedelta(hours[line_transaction] * 60 + minutes[line_transaction], unit='m')
+    )
+    product_idx = rng.integers(0, len(PRODUCTS), n_rows)
+    products = pd.DataFrame(PRODUCTS, columns=['product_category', 'product_type', 'product_detail', 'Size', 'unit_price'])
+    products['product_id'] = np.arange(1, len(PRODUCTS) + 1)
+    lines = products.iloc[product_idx].reset_index(drop=True)
+    qty = rng.integers(1, 4, n_rows)
+
+    return pd.DataFrame({
+        'transaction_id': transaction_ids,
+        'transaction_date': timestamps.strftime('%d/%m/%Y'),
+        'transaction_time': timestamps.strftime('%H:%M:%S'),
+        'transaction_qty': qty,
+        'store_id': [STORES[i][0] for i in store_idx[line_transaction]],
+        'store_location': [STORES[i][1] for i in store_idx[line_transaction]],
+        'product_id': lines['product_id'],
+        'unit_price': lines['unit_price'],
+        'product_category': lines['product_category'],
+        'product_type': lines['product_type'],
+        'product_detail': lines['product_detail'],
+        'Size': lines['Size'],
+        'Total_Bill': qty * lines['unit_price'],
+        'Month Name': timestamps.strftime('%B'),
+        'Day Name': timestamps.strftime('%A'),
+        'Day of Week': timestamps.dayofweek,
+        'Hour': timestamps.hour
+    })
+
+# Fungsi untuk mengisi database SQLite lokal dengan struktur data warehouse coffeedw
+def seed_database(url, n_rows, days=365, seed=0):
+    """
+    Membuat tabel dim_time, dim_product, dim_store, fact_sales dan
+    data_version dengan kolom yang sama seperti hasil load_to_mysql, diisi
+    n_rows baris sintetis selama `days` hari terakhir.
+    """
+    import data_version
+
+    start_date = (pd.Timestamp.today().normalize() - pd.Timedelta(days=days)).date()
+    raw = generate_sales(n_rows, start_date, days, seed)
+    dates = pd.to_datetime(raw['transaction_date'] + " " + raw['transaction_time'], format='%d/%m/%Y %H:%M:%S')
+    raw['time_id'] = [str(uuid.uuid4()) for _ in range(len(raw))]
+
+    dim_time = pd.DataFrame({
+        'time_id': raw['time_id'],
+        'transaction_date': dates.dt.strftime('%Y-%m-%d %H:%M:%S'),
+        'transaction_time': raw['transaction_time'],
+        'year': dates.dt.strftime('%Y'),
+        'month': dates.dt.strftime('%m'),
+        'month_name': raw['Month Name'],
+        'day': dates.dt.strftime('%d'),
+        'day_name': raw['Day Name'],
+        'day_of_week': raw['Day of Week'],
+        'hour': raw['Hour']
+    })
+    dim_product = raw[['product_id', 'product_category', 'product_type', 'product_detail', 'Size']].drop_duplicates().rename(columns={'Size': 'size'})
+    dim_store = raw[['store_id', 'store_location']].drop_duplicates()
+    fact_sales = raw[['transaction_id', 'time_id', 'product_id', 'store_id', 'transaction_qty', 'unit_price', 'Total_Bill']].rename(columns={'Total_Bill': 'total_bill'})
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        dim_time.to_sql('dim_time', conn, if_exists='replace', index=False, chunksize=50000)
+        dim_product.to_sql('dim_product', conn, if_exists='replace', index=False)
+        dim_store.to_sql('dim_store', conn, if_exists='replace', index=False)
+        fact_sales.to_sql('fact_sales', conn, if_exists='replace', index=False, chunksize=50000)
+        data_version.ensure_table(conn)
+        data_version.bump_version(conn, data_version.CHANGE_FULL, len(fact_sales))
+    engine.dispose()
+    return len(fact_sales)
+
+# Fungsi untuk memasang penghitung query pada engine bersama
+def track_queries(engine):
+    counter = {'queries': 0, 'lock': threading.Lock()}
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        with counter['lock']:
+            counter['queries'] += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    return counter
+
+# Versi Streamlit tempat shared_test_runtime diverifikasi (sama dengan requirements.txt)
+SHARED_RUNTIME_STREAMLIT = "1.28."
+# Jeda antar sampel RSS (detik)
+RSS_SAMPLE_INTERVAL = 0.1
+
+# Fungsi untuk membaca peak RSS seumur proses (MB)
+def lifetime_peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan bytes
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+# Fungsi untuk membaca RSS proses saat ini (MB) dari /proc, None jika tidak tersedia
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+
+# Fungsi untuk mengambil sampel RSS berkala sampai stop_event di-set
+def sample_rss(stop_event, samples):
+    """
+    ru_maxrss adalah puncak seumur proses, sehingga tingkat konkurensi
+    berikutnya selalu mewarisi puncak tingkat sebelumnya. Sampel RSS per
+    tingkat memberi puncak milik tingkat itu saja.
+    """
+    while True:
+        rss = current_rss_mb()
+        if rss is None:
+            return
+        samples.append(rss)
+        if stop_event.wait(RSS_SAMPLE_INTERVAL):
+            return
+
+# Context manager agar AppTest aman dijalankan oleh beberapa sesi bersamaan
+@contextlib.contextmanager
+def shared_test_runtime():
+    """
+    AppTest memasang Runtime tiruan global di awal setiap run dan
+    menghapusnya di akhir, sehingga run yang selesai lebih dulu menghapus
+    runtime milik sesi lain yang masih berjalan. Selama blok with, Runtime
+    tiruan terakhir disimpan dan dipakai sebagai cadangan.
+
+    Ini mengganti Runtime.instance / Runtime.exists dan membaca
+    Runtime._instance, yang merupakan internal privat Streamlit dan hanya
+    diverifikasi pada streamlit 1.28 (versi yang di-pin di requirements.txt);
+    versi lain ditolak. Method asli selalu dipulihkan saat blok selesai.
+    Hasilnya mengukur sesi AppTest dalam satu proses dengan cache bersama,
+    bukan server `streamlit run` lengkap (tanpa websocket dan browser).
+    """
+    import streamlit
+    from streamlit.runtime import Runtime
+
+    if not streamlit.__version__.startswith(SHARED_RUNTIME_STREAMLIT):
+        raise RuntimeError(
+            f"Load test multi-sesi hanya diverifikasi pada streamlit {SHARED_RUNTIME_STREAMLIT}x, "
+            f"terpasang {streamlit.__version__}."
+        )
+
+    shared = {}
+    original_instance = Runtime.__dict__['instance']
+    original_exists = Runtime.__dict__['exists']
+
+    def instance(cls):
+        if cls._instance is not None:
+            shared['runtime'] = cls._instance
+            return cls._instance
+        return shared.get('runtime') or original_instance.__func__(cls)
+
+    def exists(cls):
+        return cls._instance is not None or 'runtime' in shared
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(exists)
+    try:
+        yield
+    finally:
+        Runtime.instance = original_instance
+        Runtime.exists = original_exists
+
+# Fungsi untuk menjalankan ulang skrip AppTest (setelah widget diubah)
+def rerun(target):
+    """
+    AppTest berhenti menunggu begitu skrip selesai, lalu membaca event
+    SHUTDOWN yang dikirim sesaat kemudian. Saat CPU penuh event itu kadang
+    belum ada (KeyError 'client_state'); hasil render sudah tersimpan,
+    jadi hanya query string yang terlewat.
+    """
+    try:
+        target.run()
+    except KeyError as e:
+        if e.args != ('client_state',):
+            raise
+
+# Fungsi untuk mencari widget berdasarkan label
+def find_widget(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    return None
+
+# Fungsi untuk memilih aksi berikutnya sebuah sesi dashboard (perubahan filter acak)
+def dashboard_action(at, rng):
+    year = find_widget(at.sidebar.selectbox, "📅 Pilih Tahun:")
+    month = find_widget(at.sidebar.selectbox, "📅 Pilih Bulan:")
+    comparison = find_widget(at.sidebar.selectbox, "📊 Pembanding Growth:")
+    approx = find_widget(at.sidebar.checkbox, "≈ Mode Aproksimasi (Sketch)")
+    stores = find_widget(at.sidebar.multiselect, "🏪 Toko:")
+
+    choice = rng.random()
+    if choice < 0.35 or month is None:
+        return "year", year.select(rng.choice(year.options))
+    if choice < 0.7:
+        return "month", month.select(rng.choice(month.options))
+    if choice < 0.8 and comparison is not None:
+        return "comparison", comparison.select(rng.choice(comparison.options))
+    if choice < 0.9 and stores is not None:
+        return "store", stores.set_value(rng.sample(stores.options, rng.randint(0, len(stores.options))))
+    if approx is not None:
+        return "approx", approx.set_value(not approx.value)
+    return "year", year.select(rng.choice(year.options))
+
+# Fungsi untuk memilih aksi berikutnya sebuah sesi prediksi
+def prediction_action(at, rng, train=False):
+    button = next((b for b in at.button if b.label.startswith("🚀")), None)
+    if train and button is not None and rng.random() < 0.3:
+        return "train", button.click()
+    selectbox = at.selectbox[0] if len(at.selectbox) else None
+    if selectbox is not None:
+        return "option", selectbox.select(rng.choice(selectbox.options))
+    return "rerun", at
+
+# Fungsi untuk menjalankan satu sesi simulasi
+def run_session(session_id, page, actions, think_time, results, train=False, seed=0):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed * 1000 + session_id)
+    pages = {'dashboard': "📊 Analytics Dashboard", 'prediction': "🔮 Prediction", 'etl': "🔄 ETL"}
+
+    def record(action, started, at):
+        results.append({
+            'session': session_id,
+            'page': page,
+            'action': action,
+            'ms': (time.perf_counter() - started) * 1000,
+            'error': str(at.exception[0].value) if at is not None and len(at.exception) else None
+        })
+
+    at = AppTest.from_file(os.path.join(BASE_DIR, "main.py"), default_timeout=600)
+    try:
+        started = time.perf_counter()
+        rerun(at)
+        rerun(at.sidebar.selectbox[0].select(pages[page]))
+        record("open", started, at)
+
+        for _ in range(actions):
+            time.sleep(think_time * rng.uniform(0.5, 1.5))
+            if len(at.exception):
+                # Halaman error (mis. dependency tidak terpasang): ulangi render saja
+                action, widget = "rerun", at
+            elif page == 'dashboard':
+                action, widget = dashboard_action(at, rng)
+            elif page == 'prediction':
+                action, widget = prediction_action(at, rng, train)
+            else:
+                action, widget = "rerun", at
+            started = time.perf_counter()
+            rerun(widget)
+            record(action, started, at)
+    except Exception as e:
+        results.append({'session': session_id, 'page': page, 'action': "crash", 'ms': None, 'error': str(e)})
+
+# Skrip Streamlit kecil yang menjalankan langkah ETL halaman ETL untuk satu file CSV.
+# Load dijalankan di dalam runtime (bukan thread biasa) agar elemen st.* di
+# load_to_mysql berjalan seperti saat file di-upload di halaman ETL.
+ETL_BATCH_SCRIPT = """
+import pandas as pd
+import streamlit as st
+import etl_script
+
+raw = pd.read_csv(st.session_state['loadtest_batch'])
+etl_script.load_to_mysql(etl_script.preprocess_data(raw))
+"""
+
+# Fungsi untuk menjalankan load ETL berkala (append) sampai stop_event di-set
+def run_etl_writer(stop_event, interval, batch_rows, batch_dir, results, seed=0):
+    """
+    AppTest tidak bisa mengisi file_uploader, jadi setiap batch ditulis ke
+    CSV lalu dibaca dengan pd.read_csv dan diproses preprocess_data +
+    load_to_mysql seperti file yang di-upload di halaman ETL.
+    """
+    from streamlit.testing.v1 import AppTest
+    import incremental
+    import database
+
+    batch = 0
+    while not stop_event.wait(interval):
+        with database.get_engine().connect() as conn:
+            watermark = incremental.fact_sales_watermark(conn)
+        raw = generate_sales(batch_rows, datetime.date.today(), 1, seed + batch + 1, watermark['max_transaction_id'] + 1)
+        batch_path = os.path.join(batch_dir, "etl_batch.csv")
+        raw.to_csv(batch_path, index=False)
+
+        at = AppTest.from_string(ETL_BATCH_SCRIPT, default_timeout=600)
+        at.session_state['loadtest_batch'] = batch_path
+        started = time.perf_counter()
+        try:
+            rerun(at)
+            error = str(at.exception[0].value) if len(at.exception) else None
+        except Exception as e:
+            error = str(e)
+        results.append({'session': -1, 'page': 'etl-load', 'action': "load", 'ms': (time.perf_counter() - started) * 1000, 'error': error})
+        batch += 1
+
+# Fungsi untuk menjalankan satu tingkat konkurensi
+def run_level(n_sessions, args, counter):
+    results = []
+    # Halaman disebar sesuai bobot secara berselang (d, d, p, d, e, ...) agar
+    # tingkat konkurensi kecil pun sudah memuat campuran halaman
+    shares = (('dashboard', args.dashboard_share), ('prediction', args.prediction_share), ('etl', args.etl_share))
+    mix = [page for _, page in sorted(((k + 0.5) / weight, page) for page, weight in shares for k in range(weight))]
+    pages = [mix[i % len(mix)] for i in range(n_sessions)]
+
+    stop_event = threading.Event()
+    etl_thread = None
+    if args.etl_interval > 0:
+        etl_thread = threading.Thread(target=run_etl_writer, args=(stop_event, args.etl_interval, args.etl_rows, args.work_dir, results, args.seed), daemon=True)
+        etl_thread.start()
+
+    rss_samples = []
+    rss_thread = threading.Thread(target=sample_rss, args=(stop_event, rss_samples), daemon=True)
+    rss_thread.start()
+
+    queries_before = counter['queries']
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=run_session, args=(i, pages[i], args.actions, args.think, results, args.train, args.seed), daemon=True)
+        for i in range(n_sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stop_event.set()
+    if etl_thread is not None:
+        etl_thread.join()
+    rss_thread.join()
+
+    renders = pd.DataFrame(results)
+    # Render yang gagal (exception di halaman) tidak ikut statistik latensi
+    page_renders = renders[(renders['page'] != 'etl-load') & renders['error'].isna()].dropna(subset=['ms'])
+    latencies = page_renders['ms'].to_numpy()
+    return {
+        'sessions': n_sessions,
+        'renders': len(page_renders),
+        'errors': int(renders['error'].notna().sum()),
+        'p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else None,
+        'p95_ms': float(np.percentile(latencies, 95)) if len(latencies) else None,
+        'dashboard_p95_ms': float(np.percentile(page_renders.loc[page_renders['page'] == 'dashboard', 'ms'], 95)) if (page_renders['page'] == 'dashboard').any() else None,
+        'etl_loads': int((renders['page'] == 'etl-load').sum()),
+        'queries': counter['queries'] - queries_before,
+        'queries_per_render': (counter['queries'] - queries_before) / max(len(page_renders), 1),
+        'peak_rss_mb': max(rss_samples) if rss_samples else None,
+        'lifetime_peak_rss_mb': lifetime_peak_rss_mb(),
+        'wall_s': time.perf_counter() - started,
+        'error_samples': sorted(set(renders['error'].dropna()))[:3]
+    }
+
+# Fungsi untuk mencetak ringkasan satu tingkat konkurensi
+def print_level(level):
+    print(
+        f"sesi={level['sessions']:>3}  render={level['renders']:>4}  error={level['errors']:>3}  "
+        f"p50={level['p50_ms'] or 0:>8.0f} ms  p95={level['p95_ms'] or 0:>8.0f} ms  "
+        f"query={level['queries']:>5} ({level['queries_per_render']:.2f}/render)  "
+        f"etl={level['etl_loads']}  peak RSS={level['peak_rss_mb'] or 0:,.0f} MB "
+        f"(proses {level['lifetime_peak_rss_mb'] or 0:,.0f} MB)"
+    )
+    for sample in level['error_samples']:
+        print(f"    error: {sample[:160]}")
+
+# Fungsi utama load test
+def main():
+    parser = argparse.ArgumentParser(description="Load test multi-sesi dashboard Coffee Analytics")
+    parser.add_argument("--sessions", default="1,2,4,8", help="daftar jumlah sesi bersamaan, dipisah koma")
+    parser.add_argument("--actions", type=int, default=6, help="jumlah perubahan filter per sesi")
+    parser.add_argument("--think", type=float, default=0.5, help="rata-rata jeda antar aksi (detik)")
+    parser.add_argument("--rows", type=int, default=100000, help="jumlah baris fact_sales sintetis")
+    parser.add_argument("--days", type=int, default=365, help="rentang hari data sintetis")
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR, help="folder database, snapshot dan hasil")
+    parser.add_argument("--reseed", action="store_true", help="isi ulang database walaupun sudah ada")
+    parser.add_argument("--dashboard-share", type=int, default=7, help="bobot sesi halaman dashboard")
+    parser.add_argument("--prediction-share", type=int, default=2, help="bobot sesi halaman prediksi")
+    parser.add_argument("--etl-share", type=int, default=1, help="bobot sesi halaman ETL")
+    parser.add_argument("--train", action="store_true", help="sesi prediksi sesekali menekan tombol training")
+    parser.add_argument("--etl-interval", type=float, default=0, help="detik antar load ETL di latar belakang (0 = mati)")
+    parser.add_argument("--etl-rows", type=int, default=500, help="jumlah baris per load ETL")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    # Database, snapshot dan export load test dipisah dari data asli. Environment
+    # harus di-set sebelum modul aplikasi di-import karena dibaca saat import.
+    os.makedirs(args.work_dir, exist_ok=True)
+    db_path = os.path.join(args.work_dir, "coffeedw_loadtest.db")
+    url = f"sqlite:///{db_path}"
+    os.environ["COFFEE_DATABASE_URL"] = url
+    os.environ["COFFEE_STORE_DIR"] = os.path.join(args.work_dir, "store")
+    os.environ["COFFEE_EXPORT_DIR"] = os.path.join(args.work_dir, "exports")
+    os.environ["COFFEE_PROFILE_LOG"] = os.path.join(args.work_dir, "profile.jsonl")
+    sys.path.insert(0, BASE_DIR)
+
+    if args.reseed or not os.path.exists(db_path):
+        started = time.perf_counter()
+        rows = seed_database(url, args.rows, args.days, args.seed)
+        print(f"Database sintetis: {rows:,} baris ({time.perf_counter() - started:.1f} s) -> {db_path}")
+
+    # Tanpa prophet halaman prediksi hanya menampilkan error import; sesinya
+    # dilewati agar latensi prediksi tidak dilaporkan dari render yang gagal
+    skipped_pages = []
+    if args.prediction_share > 0 and importlib.util.find_spec("prophet") is None:
+        skipped_pages.append('prediction')
+        args.prediction_share = 0
+        print("Sesi prediksi dilewati: prophet tidak terpasang.")
+
+    import database
+    counter = track_queries(database.get_engine())
+
+    levels = []
+    with shared_test_runtime():
+        for n_sessions in [int(value) for value in args.sessions.split(",") if value]:
+            levels.append(run_level(n_sessions, args, counter))
+            print_level(levels[-1])
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'args': vars(args), 'skipped_pages': skipped_pages, 'levels': levels}, f, indent=2, default=str)
+
+if __name__ == "__main__":
+    main()
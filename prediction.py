@@ -1,11 +1,15 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-from sqlalchemy import create_engine, text
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import datetime
+import time
+import threading
+import incremental
+import data_version
+import database
+import sql_reader
 from prophet import Prophet
 from prophet.plot import plot_plotly, plot_components_plotly
 from prophet.diagnostics import cross_validation, performance_metrics
@@ -71,53 +75,124 @@ def load_prediction_css():
     """, unsafe_allow_html=True)
 
 # Fungsi untuk membuat koneksi database
-@st.cache_resource
 def create_connection():
+    # Engine dan pool koneksi dipakai bersama dalam satu proses (lihat database.py)
     try:
-        DATABASE_URL = "mysql+pymysql://root:@localhost:3306/coffeedw"
-        engine = create_engine(DATABASE_URL, echo=False)
-        
-        with engine.connect() as connection:
-            connection.execute(text("SELECT 1"))
-        
-        return engine
+        return database.get_engine()
     except Exception as e:
         st.error(f"Error connecting to MySQL: {e}")
         return None
 
+# Kolom yang dibutuhkan prepare_prophet_data (agregasi harian revenue, qty, customer)
+PREDICTION_COLUMNS = {
+    'transaction_id': 'fs.transaction_id',
+    'transaction_qty': 'fs.transaction_qty',
+    'total_bill': 'fs.total_bill',
+    'transaction_date': 'dt.transaction_date'
+}
+# Tipe ringkas tiap kolom saat hasil query dibaca per chunk
+PREDICTION_COLUMN_KINDS = {
+    'transaction_id': 'int64',
+    'transaction_qty': 'int64',
+    'total_bill': 'float',
+    'transaction_date': 'datetime'
+}
+
+# Fungsi untuk menjalankan query data prediksi (opsional hanya baris di atas watermark)
+def query_prediction_data(conn, since_transaction_id=None, expected_rows=None):
+    # Tanpa ORDER BY: prepare_prophet_data mengurutkan hasil agregasi harian sendiri
+    select_list = ",\n        ".join(PREDICTION_COLUMNS.values())
+    query = f"""
+    SELECT
+        {select_list}
+    FROM fact_sales fs
+    JOIN dim_time dt ON fs.time_id = dt.time_id
+    JOIN dim_product dp ON fs.product_id = dp.product_id
+    JOIN dim_store ds ON fs.store_id = ds.store_id
+    """
+    params = {}
+    
+    if since_transaction_id is not None:
+        query += " WHERE fs.transaction_id > :since_transaction_id"
+        params['since_transaction_id'] = since_transaction_id
+    
+    # Streaming lewat server-side cursor agar hasil tidak ditampung penuh di client
+    return sql_reader.read_sql_compact(
+        conn, query, params,
+        column_kinds=PREDICTION_COLUMN_KINDS,
+        expected_rows=expected_rows
+    )
+
+# Cache data prediksi yang dipakai bersama dan diperbarui secara incremental
+@st.cache_resource
+def get_prediction_cache():
+    # entry diganti utuh (tidak pernah diubah di tempat), sehingga boleh dibaca tanpa lock
+    return {'entry': None, 'lock': threading.Lock()}
+
+# Fungsi untuk mengecek apakah data di cache masih sesuai versi data terbaru
+def is_cache_current(entry, version_info):
+    if entry is None:
+        return False
+    if version_info is not None:
+        return version_info['version'] == entry['version']
+    return time.time() - entry['checked_at'] < 300
+
 # Fungsi untuk mengambil data untuk prediksi
-@st.cache_data(ttl=300)
 def fetch_prediction_data():
+    """
+    Mengembalikan data prediksi dari cache yang dikunci dengan versi data di
+    tabel data_version (dicek tiap rerun). Jika sejak versi cache hanya ada
+    penambahan baris, cukup baris di atas watermark yang di-query dan
+    digabung; full reload hanya dilakukan jika ETL melaporkan perubahan lain.
+    Tanpa tabel data_version, watermark fact_sales dicek paling lama tiap 5 menit.
+    Query berjalan di luar lock; lock hanya dipakai untuk menukar entry cache,
+    sehingga sesi lain tetap dilayani dari cache selama reload berlangsung.
+    """
+    cache = get_prediction_cache()
     engine = create_connection()
     if engine is None:
         return None
     
     try:
-        query = """
-        SELECT
-            fs.transaction_id,
-            fs.transaction_qty,
-            fs.unit_price,
-            fs.total_bill,
-            dt.transaction_date,
-            dt.year,
-            dt.month,
-            dt.day,
-            dt.day_of_week,
-            dt.hour,
-            dp.product_category,
-            dp.product_type,
-            ds.store_location
-        FROM fact_sales fs
-        JOIN dim_time dt ON fs.time_id = dt.time_id
-        JOIN dim_product dp ON fs.product_id = dp.product_id
-        JOIN dim_store ds ON fs.store_id = ds.store_id
-        ORDER BY dt.transaction_date DESC
-        """
-        
-        df = pd.read_sql(query, engine)
-        df['transaction_date'] = pd.to_datetime(df['transaction_date'])
-        
+        with engine.connect() as conn:
+            version_info = data_version.read_version(conn)
+            entry = cache['entry']
+            if is_cache_current(entry, version_info):
+                return entry['data']
+            
+            watermark = incremental.fact_sales_watermark(conn)
+            
+            if entry is None:
+                append_only = False
+            elif version_info is not None and entry['version'] is not None:
+                append_only = data_version.is_append_since(version_info, entry['version'])
+            else:
+                append_only = incremental.is_append_only(conn, entry['watermark'])
+            
+            if append_only and watermark == entry['watermark']:
+                df = entry['data']
+            elif append_only:
+                delta = query_prediction_data(
+                    conn,
+                    since_transaction_id=entry['watermark']['max_transaction_id'],
+                    expected_rows=max(watermark['rows'] - entry['watermark']['rows'], 0)
+                )
+                df = incremental.append_rows(entry['data'], delta)
+            else:
+                df = query_prediction_data(conn, expected_rows=watermark['rows'])
+        
+        new_entry = {
+            'data': df,
+            'watermark': watermark,
+            'version': version_info['version'] if version_info is not None else None,
+            'checked_at': time.time()
+        }
+        with cache['lock']:
+            # Sesi lain mungkin sudah menyimpan versi yang lebih baru selama query berjalan
+            current = cache['entry']
+            if (current is None or current['version'] is None or new_entry['version'] is None
+                    or new_entry['version'] >= current['version']):
+                cache['entry'] = new_entry
         return df
         
     except Exception as e:
@@ -646,7 +721,7 @@ def display_prediction_dashboard():
 
 # Function untuk refresh prediction data
 def refresh_prediction_data():
-    st.cache_data.clear()
+    get_prediction_cache.clear()
     st.rerun()
 
 if __name__ == "__main__":
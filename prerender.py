@@ -0,0 +1,104 @@
+import os
+import io
+import json
+import glob
+import datetime
+import pandas as pd
+import plotly.io as pio
+
+import data_store
+
+KEEP_PRERENDERS = 2
+
+# Fungsi untuk mendapatkan path file pre-render sebuah versi data
+def prerender_path(version, store_dir=data_store.STORE_DIR):
+    safe_version = str(version).replace(os.sep, "_").replace(":", "_")
+    return os.path.join(store_dir, f"prerender-{safe_version}.json")
+
+# Fungsi untuk membuat kunci periode (tahun, bulan) di file pre-render
+def period_key(selected_year, selected_month=None):
+    month = selected_month if selected_month and selected_month != "All Months" else "All Months"
+    return f"{selected_year}|{month}"
+
+# Fungsi untuk mengubah nilai numpy/pandas menjadi tipe JSON
+def _to_json(value):
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+# Fungsi untuk menyimpan hasil render periode default sebuah versi data
+def save_prerender(version, periods, store_dir=data_store.STORE_DIR):
+    """
+    periods berisi {period_key: {'kpis': dict, 'charts': {chart_id: figure
+    Plotly atau DataFrame}, 'data': {chart_id: DataFrame}}}. Figure disimpan
+    sebagai JSON Plotly dan DataFrame (chart tanpa figure, serta data
+    agregasi chart untuk api.py) dalam orient split.
+    """
+    payload = {
+        'version': version,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'periods': {}
+    }
+    for key, rendered in periods.items():
+        charts = {}
+        for chart_id, value in rendered['charts'].items():
+            if isinstance(value, pd.DataFrame):
+                charts[chart_id] = {'data': value.to_json(orient='split', index=False, date_format='iso')}
+            else:
+                charts[chart_id] = {'figure': pio.to_json(value, validate=False)}
+        data = {
+            chart_id: value.to_json(orient='split', index=False, date_format='iso')
+            for chart_id, value in rendered.get('data', {}).items()
+        }
+        payload['periods'][key] = {'kpis': rendered['kpis'], 'charts': charts, 'data': data}
+
+    def write_file(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, default=_to_json)
+
+    os.makedirs(store_dir, exist_ok=True)
+    data_store._atomic_write(prerender_path(version, store_dir), write_file)
+    cleanup_prerenders(store_dir)
+
+# Fungsi untuk membaca hasil pre-render sebuah versi data (None jika belum ada)
+def load_prerender(version, store_dir=data_store.STORE_DIR):
+    """
+    Mengembalikan {period_key: {'kpis', 'charts', 'data', 'payload_bytes'}}
+    dengan figure Plotly dan DataFrame yang sudah dibentuk ulang, atau None jika
+    versi ini belum di-render. payload_bytes adalah panjang JSON tersimpan
+    tiap chart, sehingga figure tidak perlu diserialisasi ulang untuk diukur.
+    """
+    path = prerender_path(version, store_dir)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    periods = {}
+    for key, rendered in payload['periods'].items():
+        charts = {}
+        payload_bytes = {}
+        for chart_id, value in rendered['charts'].items():
+            if 'data' in value:
+                charts[chart_id] = pd.read_json(io.StringIO(value['data']), orient='split')
+                payload_bytes[chart_id] = len(value['data'])
+            else:
+                charts[chart_id] = pio.from_json(value['figure'])
+                payload_bytes[chart_id] = len(value['figure'])
+        # Data chart dibaca apa adanya (tanpa tebakan tipe), sama seperti saat ditulis
+        data = {
+            chart_id: pd.read_json(io.StringIO(value), orient='split', dtype=False, convert_dates=False)
+            for chart_id, value in rendered.get('data', {}).items()
+        }
+        periods[key] = {'kpis': rendered['kpis'], 'charts': charts, 'data': data, 'payload_bytes': payload_bytes}
+    return periods
+
+# Fungsi untuk menghapus file pre-render lama
+def cleanup_prerenders(store_dir=data_store.STORE_DIR, keep=KEEP_PRERENDERS):
+    paths = sorted(glob.glob(os.path.join(store_dir, "prerender-*.json")), key=os.path.getmtime, reverse=True)
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,100 @@
+import os
+import json
+import time
+import datetime
+import threading
+import contextlib
+
+# Lokasi log profiling (satu baris JSON per render), bisa diubah lewat environment
+PROFILE_LOG = os.environ.get(
+    "COFFEE_PROFILE_LOG",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "dashboard_profile.jsonl")
+)
+
+_log_lock = threading.Lock()
+
+# Fungsi untuk memulai sesi profiling satu kali render
+def start_profile(enabled=True):
+    """
+    Mengembalikan dict profil untuk satu kali render, atau None jika
+    profiling tidak aktif. Semua fungsi di modul ini menerima None sehingga
+    pemanggil tidak perlu mengecek apakah profiling aktif.
+    """
+    if not enabled:
+        return None
+    return {'started': time.perf_counter(), 'steps': [], 'lock': threading.Lock()}
+
+# Fungsi untuk mengukur satu langkah render (aman dipanggil dari thread worker)
+@contextlib.contextmanager
+def step(profile, name, rows_in=None):
+    """
+    Context manager yang mencatat durasi sebuah langkah. Isi record['rows_out']
+    di dalam blok untuk melaporkan jumlah baris hasil langkah tersebut.
+    """
+    record = {'step': name, 'rows_in': rows_in, 'rows_out': None}
+    if profile is None:
+        yield record
+        return
+
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['ms'] = (time.perf_counter() - started) * 1000
+        record['thread'] = threading.current_thread().name
+        with profile['lock']:
+            profile['steps'].append(record)
+
+# Fungsi untuk mengubah hasil profiling menjadi baris tabel
+def summarize(profile):
+    if profile is None:
+        return []
+    with profile['lock']:
+        steps = list(profile['steps'])
+    return [
+        {
+            'Langkah': record['step'],
+            'Durasi (ms)': round(record['ms'], 1),
+            'Baris Masuk': record['rows_in'],
+            'Baris Keluar': record['rows_out'],
+            'Thread': record['thread']
+        }
+        for record in steps
+    ]
+
+# Fungsi untuk menghitung total waktu render sejak profiling dimulai (ms)
+def elapsed_ms(profile):
+    if profile is None:
+        return 0.0
+    return (time.perf_counter() - profile['started']) * 1000
+
+# Fungsi untuk menambahkan hasil profiling ke log lokal
+def write_log(profile, context=None, log_path=PROFILE_LOG):
+    """
+    Menambahkan satu baris JSON (waktu, konteks render seperti periode dan
+    engine, total durasi, dan setiap langkah) ke file log. Log ini bisa
+    dianalisis belakangan untuk mencari langkah yang paling sering lambat.
+    """
+    if profile is None:
+        return
+
+    with profile['lock']:
+        steps = [
+            {key: record.get(key) for key in ('step', 'ms', 'rows_in', 'rows_out', 'thread')}
+            for record in profile['steps']
+        ]
+    entry = {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'total_ms': elapsed_ms(profile),
+        'context': context or {},
+        'steps': steps
+    }
+
+    try:
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        with _log_lock:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+    except OSError:
+        # Log profiling tidak boleh mengganggu tampilan dashboard
+        pass
@@ -0,0 +1,230 @@
+import os
+import threading
+import data_store
+
+# DuckDB bersifat opsional: tanpa DuckDB dashboard tetap memakai pandas
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Engine aktif secara default jika COFFEE_QUERY_ENGINE=duckdb
+ENABLED_BY_DEFAULT = os.environ.get("COFFEE_QUERY_ENGINE", "").lower() == "duckdb"
+KEEP_CONNECTIONS = 2
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+# Fungsi untuk mengecek apakah DuckDB terpasang
+def is_available():
+    return duckdb is not None
+
+# Fungsi untuk mendapatkan koneksi DuckDB untuk snapshot versi tertentu
+def get_connection(version):
+    """
+    Membuka database DuckDB in-process (tanpa server) dengan snapshot Arrow
+    versi tertentu terdaftar sebagai tabel `sales`. Snapshot dipetakan ke
+    memori dan dibaca DuckDB tanpa salinan. Satu koneksi dibuat per versi dan
+    dipakai bersama; tiap query memakai cursor sendiri (dengan tabel `sales`
+    didaftarkan ulang di cursor tersebut) sehingga aman dipanggil dari banyak
+    sesi sekaligus. Mengembalikan dict {'connection', 'table', 'version'}, atau
+    None jika DuckDB tidak tersedia atau snapshot belum ada.
+    """
+    if duckdb is None or version is None:
+        return None
+
+    with _connections_lock:
+        engine = _connections.get(version)
+        if engine is not None:
+            return engine
+
+        table = data_store.open_table(version)
+        if table is None:
+            return None
+
+        engine = {
+            'connection': duckdb.connect(database=":memory:"),
+            'table': table,
+            'version': version
+        }
+        _connections[version] = engine
+
+        # Koneksi versi lama hanya dilepas dari cache, tidak ditutup: query sesi
+        # lain yang masih memakainya tetap berjalan, dan koneksi ditutup DuckDB
+        # begitu referensi terakhir dilepas
+        for old_version in list(_connections)[:-KEEP_CONNECTIONS]:
+            _connections.pop(old_version)
+
+        return engine
+
+# Fungsi untuk menjalankan query dan mengembalikan DataFrame
+def run_query(engine, sql, params=None):
+    cursor = engine['connection'].cursor()
+    try:
+        cursor.register("sales", engine['table'])
+        return cursor.execute(sql, params or []).df()
+    finally:
+        cursor.close()
+
+# Fungsi untuk membuat klausa WHERE rentang tanggal
+def date_range_clause(start, end):
+    if start is None:
+        return "TRUE", []
+    return "transaction_date >= ? AND transaction_date < ?", [start.to_pydatetime(), end.to_pydatetime()]
+
+# Fungsi untuk membuat klausa WHERE dari rentang tanggal dan filter dimensi
+def filter_clause(start, end, filters=None):
+    """
+    Menambahkan filter dimensi dashboard (mis. {'store_location': [...]}) ke
+    klausa rentang tanggal sebagai IN (...) sehingga penyaringan dilakukan
+    DuckDB. Kunci 'date_range' diabaikan karena sudah tercermin di start/end.
+    """
+    where, params = date_range_clause(start, end)
+    for col, values in (filters or {}).items():
+        if col == 'date_range' or not values:
+            continue
+        placeholders = ", ".join("?" for _ in values)
+        where += f' AND CAST("{col}" AS VARCHAR) IN ({placeholders})'
+        params = params + [str(value) for value in values]
+    return where, params
+
+# Fungsi untuk membuat query agregasi sebuah chart dashboard
+def chart_query(chart_id, selected_year, selected_month, granularity=None):
+    if chart_id == 'sales_trend':
+        by_day = granularity == 'day' or (granularity is None and selected_month and selected_month != "All Months")
+        if granularity == 'year' or (granularity is None and selected_year == "All Time"):
+            period, period_sort = "CAST(year(transaction_date) AS VARCHAR)", "year(transaction_date)"
+        elif by_day:
+            # Urutan harian = nomor hari sejak epoch (sama dengan versi pandas)
+            period = "strftime(transaction_date, '%Y-%m-%d')"
+            period_sort = "date_diff('day', DATE '1970-01-01', CAST(transaction_date AS DATE))"
+        else:
+            period, period_sort = "strftime(transaction_date, '%Y-%m')", "month(transaction_date)"
+        return f"""
+            SELECT {period} AS period,
+                   {period_sort} AS period_sort,
+                   SUM(total_bill) AS total_bill,
+                   COUNT(DISTINCT transaction_id) AS transaction_id
+            FROM sales WHERE {{where}}
+            GROUP BY 1, 2 ORDER BY period_sort
+        """
+    if chart_id == 'menu_performance':
+        return """
+            SELECT CAST(product_detail AS VARCHAR) AS product_detail,
+                   CAST(SUM(transaction_qty) AS BIGINT) AS transaction_qty
+            FROM sales WHERE {where}
+            GROUP BY 1 ORDER BY transaction_qty DESC LIMIT 10
+        """
+    if chart_id == 'revenue_category':
+        return """
+            SELECT CAST(product_category AS VARCHAR) AS product_category,
+                   SUM(total_bill) AS total_bill
+            FROM sales WHERE {where}
+            GROUP BY 1 ORDER BY total_bill ASC
+        """
+    if chart_id == 'peak_hours':
+        return """
+            SELECT hour, CAST(SUM(transaction_qty) AS BIGINT) AS transaction_qty
+            FROM sales WHERE {where} AND hour IS NOT NULL
+            GROUP BY 1 ORDER BY hour
+        """
+    if chart_id == 'branch_performance':
+        return """
+            SELECT CAST(store_location AS VARCHAR) AS store_location,
+                   SUM(total_bill) AS total_bill
+            FROM sales WHERE {where}
+            GROUP BY 1 ORDER BY store_location
+        """
+    if chart_id == 'revenue_customer_branch':
+        return """
+            SELECT CAST(store_location AS VARCHAR) AS "Branch",
+                   SUM(total_bill) AS "Revenue",
+                   COUNT(DISTINCT transaction_id) AS "Customers",
+                   CAST(SUM(transaction_qty) AS BIGINT) AS "Items_Sold",
+                   SUM(total_bill) / COUNT(DISTINCT transaction_id) AS "Revenue_per_Customer"
+            FROM sales WHERE {where}
+            GROUP BY 1 ORDER BY "Branch"
+        """
+    if chart_id == 'category_by_branch':
+        return """
+            SELECT CAST(store_location AS VARCHAR) AS store_location,
+                   CAST(product_category AS VARCHAR) AS product_category,
+                   SUM(total_bill) AS total_bill,
+                   CAST(SUM(transaction_qty) AS BIGINT) AS transaction_qty
+            FROM sales WHERE {where}
+            GROUP BY 1, 2 ORDER BY 1, 2
+        """
+    raise KeyError(f"Chart tidak dikenal: {chart_id}")
+
+# Fungsi untuk menghitung data agregasi chart lewat SQL
+def aggregate(engine, chart_id, bounds, selected_year, selected_month, filters=None, granularity=None):
+    """
+    Versi SQL dari fungsi aggregate_* di dashboard. bounds adalah hasil
+    dashboard.get_filter_bounds (None untuk All Time) dan filters adalah
+    filter lanjutan dashboard. Kolom hasil sama dengan versi pandas sehingga
+    bisa langsung dipakai fungsi build_*_figure.
+    """
+    start, end = (bounds[0], bounds[1]) if bounds is not None else (None, None)
+    where, params = filter_clause(start, end, filters)
+    return run_query(engine, chart_query(chart_id, selected_year, selected_month, granularity).format(where=where), params)
+
+# Fungsi untuk merangkum angka KPI mentah lewat SQL
+def summarize_period(engine, bounds, show_growth=True, filters=None):
+    """
+    Versi SQL dari dashboard.summarize_period. Mengembalikan None jika periode
+    terpilih tidak memiliki data.
+    """
+    start, end = (bounds[0], bounds[1]) if bounds is not None else (None, None)
+    where, params = filter_clause(start, end, filters)
+
+    totals = run_query(engine, f"""
+        SELECT COUNT(*) AS rows,
+               COALESCE(SUM(total_bill), 0) AS total_revenue,
+               COUNT(DISTINCT transaction_id) AS total_customers
+        FROM sales WHERE {where}
+    """, params).iloc[0]
+    if totals['rows'] == 0:
+        return None
+
+    top_menu = run_query(engine, f"""
+        SELECT CAST(product_detail AS VARCHAR) AS product_detail, SUM(transaction_qty) AS qty
+        FROM sales WHERE {where}
+        GROUP BY 1 ORDER BY qty DESC, product_detail LIMIT 1
+    """, params)
+    peak = run_query(engine, f"""
+        SELECT hour FROM sales WHERE {where} AND hour IS NOT NULL
+        GROUP BY hour ORDER BY SUM(transaction_qty) DESC, hour LIMIT 1
+    """, params)
+    best_branch = run_query(engine, f"""
+        SELECT CAST(store_location AS VARCHAR) AS store_location FROM sales WHERE {where}
+        GROUP BY 1 ORDER BY SUM(total_bill) DESC, store_location LIMIT 1
+    """, params)
+
+    summary = {
+        'total_revenue': float(totals['total_revenue']),
+        'top_menu': top_menu['product_detail'].iloc[0] if not top_menu.empty else "N/A",
+        'top_menu_qty': int(top_menu['qty'].iloc[0]) if not top_menu.empty else 0,
+        'peak_hour': int(peak['hour'].iloc[0]) if not peak.empty else None,
+        'best_branch': best_branch['store_location'].iloc[0] if not best_branch.empty else "N/A",
+        'total_customers': int(totals['total_customers']),
+        'prev_revenue': None,
+        'prev_menu_qty': None,
+        'prev_customers': None
+    }
+
+    if show_growth and bounds is not None:
+        prev_where, prev_params = filter_clause(bounds[2], bounds[3], filters)
+        previous = run_query(engine, f"""
+            SELECT COUNT(*) AS rows,
+                   COALESCE(SUM(total_bill), 0) AS prev_revenue,
+                   COUNT(DISTINCT transaction_id) AS prev_customers,
+                   COALESCE(SUM(CASE WHEN CAST(product_detail AS VARCHAR) = ? THEN transaction_qty ELSE 0 END), 0) AS prev_menu_qty
+            FROM sales WHERE {prev_where}
+        """, [summary['top_menu']] + prev_params).iloc[0]
+        if previous['rows'] > 0:
+            summary['prev_revenue'] = float(previous['prev_revenue'])
+            summary['prev_customers'] = int(previous['prev_customers'])
+            if summary['top_menu'] != "N/A":
+                summary['prev_menu_qty'] = int(previous['prev_menu_qty'])
+
+    return summary
@@ -0,0 +1,121 @@
+import os
+import time
+import threading
+
+import data_version
+import prerender
+import traffic
+
+# Jeda (detik) sebelum versi yang gagal di-refresh boleh dicoba lagi
+REFRESH_RETRY_SECONDS = float(os.environ.get("COFFEE_REFRESH_RETRY_SECONDS", 300))
+
+# Status job refresh (satu job per proses). Disimpan di dict modul, bukan
+# st.cache_resource, karena job juga diminta dari luar script run Streamlit
+# (mis. setelah load ETL) dan cache Streamlit tidak aktif di sana.
+_state = {
+    'thread': None,
+    'pending': None,
+    'version': None,
+    'error': None,
+    'failed': None,
+    'lock': threading.Lock()
+}
+
+# Fungsi untuk membaca versi snapshot terbaru dari tabel data_version
+def latest_version(engine):
+    import dashboard
+
+    with engine.connect() as connection:
+        version_info = data_version.read_version(connection)
+    if version_info is None:
+        return None
+    return dashboard.get_snapshot_key(f"v{version_info['version']}")
+
+# Fungsi untuk menyiapkan sebuah versi data: snapshot, traffic cube, dan (opsional) pre-render
+def prepare_version(engine, version=None, render=False):
+    """
+    Snapshot dibuka lewat dashboard.open_dataset, sehingga versi yang sama
+    hanya dibangun sekali walaupun sesi dashboard memintanya bersamaan.
+    Pre-render periode default hanya dibuat jika render=True dan file
+    pre-render versi ini belum ada. Mengembalikan versi yang disiapkan.
+    """
+    # dashboard di-import di sini agar etl_script cukup meng-import modul ini
+    import dashboard
+
+    version = version or latest_version(engine)
+    if version is None:
+        return None
+
+    df = dashboard.open_dataset(version, engine)
+    # Traffic cube versi baru cukup ditambah baris hasil load terakhir
+    traffic.ensure_cube(version, df)
+    if render and not os.path.exists(prerender.prerender_path(version)):
+        prerender.save_prerender(version, dashboard.render_default_periods(df))
+    return version
+
+# Fungsi untuk meminta refresh di latar belakang (dashboard saat versi berubah, ETL setelah load)
+def start_refresh(engine, version=None, render=False):
+    """
+    Hanya ada satu thread refresh per proses. Permintaan yang datang saat
+    job masih berjalan digabung ke satu permintaan tertunda (versi terbaru,
+    render jika salah satu meminta) dan dijalankan setelah job selesai,
+    sehingga pre-render setelah ETL dan refresh dari sesi dashboard tidak
+    membangun dataset yang sama dua kali. version=None berarti versi terbaru
+    di tabel data_version. Versi yang gagal tidak diminta ulang oleh setiap
+    rerun dashboard: permintaan versi yang sama diabaikan selama
+    REFRESH_RETRY_SECONDS. Mengembalikan False jika permintaan diabaikan.
+    """
+    with _state['lock']:
+        failed = _state['failed']
+        if (version is not None and failed is not None and failed['version'] == version
+                and time.monotonic() - failed['at'] < REFRESH_RETRY_SECONDS):
+            return False
+
+        pending = _state['pending']
+        if pending is not None:
+            version = None if version is None or pending['version'] is None else version
+            render = render or pending['render']
+        _state['pending'] = {'engine': engine, 'version': version, 'render': render}
+
+        if _state['thread'] is None:
+            thread = threading.Thread(target=_run_pending, name="dashboard-refresh", daemon=True)
+            _state['thread'] = thread
+            thread.start()
+        return True
+
+# Fungsi worker: menjalankan permintaan tertunda sampai habis
+def _run_pending():
+    while True:
+        with _state['lock']:
+            job = _state['pending']
+            _state['pending'] = None
+            if job is None:
+                _state['thread'] = None
+                return
+
+        try:
+            version = prepare_version(job['engine'], job['version'], job['render'])
+        except Exception as e:
+            with _state['lock']:
+                _state['error'] = str(e)
+                _state['failed'] = {'version': job['version'], 'at': time.monotonic()}
+        else:
+            with _state['lock']:
+                _state['version'] = version
+                _state['error'] = None
+                _state['failed'] = None
+
+# Fungsi untuk membaca status refresh terakhir
+def get_status():
+    with _state['lock']:
+        return {
+            'running': _state['thread'] is not None,
+            'version': _state['version'],
+            'error': _state['error']
+        }
+
+# Fungsi untuk menunggu job refresh yang sedang berjalan selesai (mis. di test atau skrip batch)
+def wait(timeout=None):
+    thread = _state['thread']
+    if thread is not None:
+        thread.join(timeout)
@@ -0,0 +1,428 @@
+import math
+import numpy as np
+import pandas as pd
+
+# Parameter sketch (HLL disimpan sparse: hanya register terisi, 3 byte per register)
+HLL_PRECISION = 12
+TOP_PRODUCTS_PER_CELL = 20
+TDIGEST_COMPRESSION = 200
+# Chart dashboard yang bisa dijawab dari sketch (chart lain cukup penjumlahan biasa)
+SUPPORTED_CHARTS = ['sales_trend', 'menu_performance', 'revenue_customer_branch']
+
+# Fungsi hash 64-bit (splitmix64) untuk array integer
+def hash64(values, seed=0):
+    with np.errstate(over='ignore'):
+        x = np.asarray(values).astype(np.uint64) + np.uint64((0x9E3779B97F4A7C15 * (seed + 1)) % 2 ** 64)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+# Fungsi untuk mengambil posisi elemen CSR milik beberapa sel sekaligus
+def csr_positions(offsets, cells):
+    """
+    Sketch per sel disimpan berurutan dalam satu array (mirip CSR): elemen sel
+    c ada di [offsets[c], offsets[c + 1]). Mengembalikan posisi semua elemen
+    milik sel-sel yang diminta tanpa loop Python.
+    """
+    cells = np.asarray(cells, dtype=np.int64)
+    starts = offsets[cells]
+    lengths = offsets[cells + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+
+# Fungsi untuk membangun register HyperLogLog sparse per sel
+def hll_build(ids, cells, n_cells, precision=HLL_PRECISION):
+    """
+    Hanya register yang terisi disimpan (index register uint16 + rank uint8
+    per sel, format CSR). Hasil estimasinya sama persis dengan register dense
+    berpresisi sama. Sparse lebih kecil selama satu sel hari x toko mengisi
+    kurang dari sepertiga dari 2^precision register (kira-kira < 1.500
+    transaksi per toko per hari).
+    """
+    m = 1 << precision
+    hashes = hash64(ids)
+    register = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    rest_bits = 64 - precision
+    rest = hashes & np.uint64((1 << rest_bits) - 1)
+    # Panjang bit sisa hash (maks. 52 bit, tepat di float64) untuk menghitung leading zero
+    _, bit_length = np.frexp(rest.astype(np.float64))
+    rank = (rest_bits - bit_length + 1).astype(np.uint8)
+
+    best = pd.Series(rank).groupby(cells.astype(np.int64) * m + register).max()
+    keys = best.index.to_numpy()
+    return {
+        'precision': precision,
+        'offsets': np.searchsorted(keys // m, np.arange(n_cells + 1)),
+        'registers': (keys % m).astype(np.uint16),
+        'ranks': best.to_numpy().astype(np.uint8)
+    }
+
+# Fungsi untuk menggabungkan HLL beberapa sel menjadi register dense
+def hll_merge(hll, cells):
+    positions = csr_positions(hll['offsets'], cells)
+    registers = np.zeros(1 << hll['precision'], dtype=np.uint8)
+    if len(positions) == 0:
+        return registers
+    # Urutkan (register, rank); entri terakhir tiap register adalah rank terbesarnya
+    keys = np.sort((hll['registers'][positions].astype(np.uint32) << np.uint32(6)) | hll['ranks'][positions])
+    last = np.append(keys[1:] >> np.uint32(6) != keys[:-1] >> np.uint32(6), True)
+    registers[keys[last] >> np.uint32(6)] = keys[last] & np.uint32(63)
+    return registers
+
+# Fungsi untuk mengestimasi jumlah nilai unik dari register HLL yang sudah digabung
+def hll_estimate(registers):
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros > 0:
+        # Koreksi rentang kecil (linear counting)
+        estimate = m * math.log(m / zeros)
+    return estimate
+
+# Fungsi untuk menghitung batas error relatif HLL (95%)
+def hll_error(precision=HLL_PRECISION):
+    return 2 * 1.04 / math.sqrt(1 << precision)
+
+# Fungsi untuk menyimpan top-K produk (qty & revenue exact) per sel
+def top_products_build(product_codes, qty, revenue, cells, n_cells, n_products, k=TOP_PRODUCTS_PER_CELL):
+    """
+    Untuk setiap sel hanya K produk dengan qty terbesar yang disimpan (format
+    CSR), ditambah 'floor' = qty produk ke-(K + 1) di sel tersebut. Produk
+    yang tidak tersimpan di sebuah sel paling banyak terjual sebesar floor
+    sel itu, sehingga hasil penggabungan sel adalah batas bawah dengan error
+    maks. jumlah floor sel terpilih (pasti, bukan peluang).
+    """
+    totals = pd.DataFrame({'cell': cells, 'product': product_codes, 'qty': qty, 'revenue': revenue})
+    totals = totals.groupby(['cell', 'product'], sort=False).sum().reset_index()
+    order = np.lexsort((-totals['qty'].to_numpy(), totals['cell'].to_numpy()))
+    totals = totals.iloc[order].reset_index(drop=True)
+    cell_values = totals['cell'].to_numpy()
+    rank = np.arange(len(totals)) - np.searchsorted(cell_values, cell_values)
+
+    floor = np.zeros(n_cells, dtype=np.int32)
+    overflow = rank == k
+    floor[cell_values[overflow]] = totals['qty'].to_numpy()[overflow]
+
+    kept = totals[rank < k]
+    return {
+        'offsets': np.searchsorted(kept['cell'].to_numpy(), np.arange(n_cells + 1)),
+        'products': kept['product'].to_numpy().astype(np.int16 if n_products < 2 ** 15 else np.int32),
+        'qty': kept['qty'].to_numpy().astype(np.int32),
+        'revenue': kept['revenue'].to_numpy().astype(np.float32),
+        'floor': floor
+    }
+
+# Fungsi untuk menjumlahkan qty dan revenue per produk dari beberapa sel
+def top_products_merge(top, cells, n_products):
+    positions = csr_positions(top['offsets'], cells)
+    products = top['products'][positions]
+    qty = np.bincount(products, weights=top['qty'][positions], minlength=n_products)
+    revenue = np.bincount(products, weights=top['revenue'][positions], minlength=n_products)
+    return qty, revenue, float(top['floor'][np.asarray(cells, dtype=np.int64)].sum())
+
+# Fungsi untuk memadatkan centroid t-digest (scale function k1)
+def tdigest_compress(means, weights, compression=TDIGEST_COMPRESSION):
+    if len(means) == 0:
+        return means, weights
+    order = np.argsort(means, kind='stable')
+    means, weights = means[order], weights[order]
+    cumulative = np.cumsum(weights)
+    q = (cumulative - weights / 2) / cumulative[-1]
+    k = compression / (2 * math.pi) * np.arcsin(2 * q - 1)
+    bucket = np.floor(k - k.min()).astype(np.int64)
+    totals = np.bincount(bucket, weights=weights)
+    sums = np.bincount(bucket, weights=means * weights)
+    keep = totals > 0
+    return sums[keep] / totals[keep], totals[keep]
+
+# Fungsi untuk membangun t-digest semua sel sekaligus (format CSR)
+def tdigest_build(values, cells, n_cells, compression=TDIGEST_COMPRESSION):
+    """
+    Hasilnya sama dengan tdigest_compress per sel (bobot 1 per nilai), tetapi
+    dihitung vektor untuk semua sel lalu disimpan sebagai satu array centroid
+    float32 dengan offsets per sel.
+    """
+    order = np.lexsort((values, cells))
+    values, cells = values[order], cells[order].astype(np.int64)
+    counts = np.bincount(cells, minlength=n_cells)
+    rank = np.arange(len(values)) - (np.cumsum(counts) - counts)[cells]
+    total = counts[cells]
+
+    scale = compression / (2 * math.pi)
+    k = scale * np.arcsin(2 * (rank + 0.5) / total - 1)
+    k_first = scale * np.arcsin(2 * 0.5 / total - 1)
+    keys = cells * (compression + 1) + np.floor(k - k_first).astype(np.int64)
+
+    starts = np.flatnonzero(np.append(True, keys[1:] != keys[:-1])) if len(keys) else np.empty(0, dtype=np.int64)
+    weights = np.diff(np.append(starts, len(keys)))
+    means = np.add.reduceat(values, starts) / weights if len(starts) else np.empty(0)
+    return {
+        'offsets': np.searchsorted(cells[starts], np.arange(n_cells + 1)),
+        'means': means.astype(np.float32),
+        'weights': weights.astype(np.float32)
+    }
+
+# Fungsi untuk menggabungkan t-digest beberapa sel
+def tdigest_merge(digest, cells, compression=TDIGEST_COMPRESSION):
+    positions = csr_positions(digest['offsets'], cells)
+    return tdigest_compress(
+        digest['means'][positions].astype(np.float64),
+        digest['weights'][positions].astype(np.float64),
+        compression
+    )
+
+# Fungsi untuk mengestimasi kuantil dari t-digest
+def tdigest_quantile(digest, q):
+    means, weights = digest
+    if len(means) == 0:
+        return None
+    cumulative = np.cumsum(weights)
+    return float(np.interp(q * cumulative[-1], cumulative - weights / 2, means))
+
+# Fungsi untuk menghitung batas error rank t-digest pada kuantil q (dalam poin persentil)
+def tdigest_error(q, compression=TDIGEST_COMPRESSION):
+    return 100 * math.pi * math.sqrt(q * (1 - q)) / compression
+
+# Fungsi untuk membangun semua sketch per hari dan toko dari dataset dashboard
+def build_sketch_store(df):
+    """
+    Membagi dataset ke sel (hari, toko) lalu menyimpan untuk setiap sel:
+    revenue, qty dan qty per jam (exact, hanya penjumlahan), HyperLogLog
+    sparse untuk transaksi unik, top-K produk (qty & revenue) dengan batas
+    qty produk yang tidak tersimpan, dan t-digest untuk ukuran tiket per
+    transaksi. Sketch yang ukurannya berbeda per sel disimpan dalam format
+    CSR (satu array + offsets per sel). Semua sketch bisa digabung (max /
+    jumlah / merge centroid), sehingga metrik periode apa pun dijawab dengan
+    menggabungkan sel tanpa membaca baris mentah.
+    """
+    dates = df['transaction_date'].to_numpy()
+    store_codes = df['store_location'].cat.codes.to_numpy().astype(np.int64)
+    valid = ~np.isnat(dates) & (store_codes >= 0)
+
+    day_values = dates.astype('datetime64[D]')
+    day_codes, days = pd.factorize(day_values[valid], sort=True)
+    stores = df['store_location'].cat.categories
+    n_days, n_stores = len(days), len(stores)
+    n_cells = n_days * n_stores
+    cells = day_codes.astype(np.int64) * n_stores + store_codes[valid]
+
+    total_bill = df['total_bill'].to_numpy(dtype=np.float64)[valid]
+    qty = df['transaction_qty'].to_numpy(dtype=np.float64)[valid]
+    ids = df['transaction_id'].to_numpy()[valid]
+    product_codes = df['product_detail'].cat.codes.to_numpy().astype(np.int64)[valid]
+    products = df['product_detail'].cat.categories
+
+    store = {
+        'days': pd.DatetimeIndex(days),
+        'stores': stores,
+        'products': products,
+        'shape': (n_days, n_stores),
+        'revenue': np.bincount(cells, weights=total_bill, minlength=n_cells).reshape(n_days, n_stores),
+        'qty': np.bincount(cells, weights=qty, minlength=n_cells).reshape(n_days, n_stores),
+        'hll': hll_build(ids, cells, n_cells)
+    }
+
+    hours = df['hour'].to_numpy(dtype=np.float64, na_value=np.nan)[valid] if 'hour' in df.columns else np.full(len(cells), np.nan)
+    has_hour = ~np.isnan(hours)
+    store['hour_qty'] = np.bincount(
+        cells[has_hour] * 24 + hours[has_hour].astype(np.int64),
+        weights=qty[has_hour],
+        minlength=n_cells * 24
+    ).astype(np.int32).reshape(n_days, n_stores, 24)
+
+    has_product = product_codes >= 0
+    store['top_products'] = top_products_build(
+        product_codes[has_product], qty[has_product], total_bill[has_product],
+        cells[has_product], n_cells, len(products)
+    )
+
+    # t-digest ukuran tiket (total bill per transaksi) per sel
+    tickets = pd.DataFrame({'transaction_id': ids, 'cell': cells, 'total_bill': total_bill})
+    tickets = tickets.groupby('transaction_id', sort=False).agg(cell=('cell', 'first'), total_bill=('total_bill', 'sum'))
+    store['tdigest'] = tdigest_build(tickets['total_bill'].to_numpy(), tickets['cell'].to_numpy(), n_cells)
+
+    return store
+
+# Fungsi untuk menghitung ukuran sketch store di memori (bytes)
+def store_bytes(sketch_store):
+    total = 0
+    for value in sketch_store.values():
+        arrays = value.values() if isinstance(value, dict) else [value]
+        total += sum(array.nbytes for array in arrays if isinstance(array, np.ndarray))
+    return total
+
+# Fungsi untuk memilih sel (rentang hari, daftar toko) dari batas periode dan filter toko
+def select_cells(sketch_store, start=None, end=None, stores=None):
+    days = sketch_store['days']
+    d0 = days.searchsorted(pd.Timestamp(start)) if start is not None else 0
+    d1 = days.searchsorted(pd.Timestamp(end)) if end is not None else len(days)
+    if stores:
+        store_idx = sketch_store['stores'].get_indexer(list(stores))
+        store_idx = store_idx[store_idx >= 0]
+    else:
+        store_idx = np.arange(sketch_store['shape'][1])
+    return slice(d0, d1), store_idx
+
+# Fungsi untuk mengambil array sketch dari sel terpilih
+def take_cells(sketch_store, name, day_slice, store_idx):
+    return sketch_store[name][day_slice][:, store_idx]
+
+# Fungsi untuk mengubah sel terpilih menjadi nomor sel (hari * jumlah toko + toko)
+def cell_ids(sketch_store, day_slice, store_idx):
+    n_days, n_stores = sketch_store['shape']
+    day_range = np.arange(*day_slice.indices(n_days), dtype=np.int64)
+    return (day_range[:, None] * n_stores + np.asarray(store_idx, dtype=np.int64)[None, :]).ravel()
+
+# Fungsi untuk mengestimasi transaksi unik dari sel terpilih
+def approx_distinct(sketch_store, day_slice, store_idx):
+    cells = cell_ids(sketch_store, day_slice, store_idx)
+    if len(cells) == 0:
+        return 0
+    return int(round(hll_estimate(hll_merge(sketch_store['hll'], cells))))
+
+# Fungsi untuk mengestimasi top produk dari sel terpilih
+def approx_top_products(sketch_store, day_slice, store_idx, n=10):
+    """
+    Qty dan revenue top-K setiap sel dijumlahkan per produk. Hasilnya batas
+    bawah; qty sebenarnya paling banyak lebih besar sebesar error yang
+    dikembalikan approx_qty_error.
+    """
+    products = sketch_store['products']
+    qty, revenue, _ = top_products_merge(sketch_store['top_products'], cell_ids(sketch_store, day_slice, store_idx), len(products))
+    found = np.flatnonzero(qty > 0)
+    found = found[np.argsort(-qty[found], kind='stable')][:n]
+    return pd.DataFrame({
+        'product_detail': products[found],
+        'transaction_qty': qty[found].astype(np.int64),
+        'total_bill': revenue[found]
+    })
+
+# Fungsi untuk mengestimasi qty sebuah produk dari sel terpilih
+def approx_product_qty(sketch_store, day_slice, store_idx, product):
+    products = sketch_store['products']
+    code = products.get_indexer([product])[0]
+    if code < 0:
+        return 0
+    qty, _, _ = top_products_merge(sketch_store['top_products'], cell_ids(sketch_store, day_slice, store_idx), len(products))
+    return int(qty[code])
+
+# Fungsi untuk menghitung batas error qty produk dari sel terpilih (maks. kekurangan, pasti)
+def approx_qty_error(sketch_store, day_slice, store_idx):
+    return float(sketch_store['top_products']['floor'][cell_ids(sketch_store, day_slice, store_idx)].sum())
+
+# Fungsi untuk mengestimasi kuantil ukuran tiket dari sel terpilih
+def approx_ticket_quantiles(sketch_store, day_slice, store_idx, quantiles=(0.5, 0.9)):
+    digest = tdigest_merge(sketch_store['tdigest'], cell_ids(sketch_store, day_slice, store_idx))
+    return {q: tdigest_quantile(digest, q) for q in quantiles}
+
+# Fungsi untuk merangkum angka KPI mentah dari sketch
+def summarize_period(sketch_store, bounds, show_growth=True, stores=None):
+    """
+    Versi sketch dari dashboard.summarize_period (format dict sama). Revenue,
+    jam tersibuk dan cabang terbaik dihitung exact dari jumlah per sel;
+    customer dari HyperLogLog, top menu dari top-K per sel. Batas error setiap
+    angka perkiraan ada di summary['approx'].
+    """
+    start, end = (bounds[0], bounds[1]) if bounds is not None else (None, None)
+    day_slice, store_idx = select_cells(sketch_store, start, end, stores)
+
+    revenue = take_cells(sketch_store, 'revenue', day_slice, store_idx)
+    if revenue.size == 0 or take_cells(sketch_store, 'qty', day_slice, store_idx).sum() == 0:
+        return None
+
+    top = approx_top_products(sketch_store, day_slice, store_idx, n=1)
+    hour_qty = take_cells(sketch_store, 'hour_qty', day_slice, store_idx).sum(axis=(0, 1))
+    branch_revenue = revenue.sum(axis=0)
+    ticket = approx_ticket_quantiles(sketch_store, day_slice, store_idx)
+
+    summary = {
+        'total_revenue': float(revenue.sum()),
+        'top_menu': top['product_detail'].iloc[0] if not top.empty else "N/A",
+        'top_menu_qty': int(top['transaction_qty'].iloc[0]) if not top.empty else 0,
+        'peak_hour': int(hour_qty.argmax()) if hour_qty.sum() > 0 else None,
+        'best_branch': sketch_store['stores'][store_idx[branch_revenue.argmax()]] if len(store_idx) else "N/A",
+        'total_customers': approx_distinct(sketch_store, day_slice, store_idx),
+        'prev_revenue': None,
+        'prev_menu_qty': None,
+        'prev_customers': None,
+        'approx': {
+            'customers_error': hll_error(),
+            'menu_qty_error': approx_qty_error(sketch_store, day_slice, store_idx),
+            'ticket_p50': ticket[0.5],
+            'ticket_p90': ticket[0.9],
+            'ticket_p50_error': tdigest_error(0.5),
+            'ticket_p90_error': tdigest_error(0.9)
+        }
+    }
+
+    if show_growth and bounds is not None:
+        prev_slice, _ = select_cells(sketch_store, bounds[2], bounds[3], stores)
+        prev_revenue = take_cells(sketch_store, 'revenue', prev_slice, store_idx)
+        if prev_revenue.size and take_cells(sketch_store, 'qty', prev_slice, store_idx).sum() > 0:
+            summary['prev_revenue'] = float(prev_revenue.sum())
+            summary['prev_customers'] = approx_distinct(sketch_store, prev_slice, store_idx)
+            if summary['top_menu'] != "N/A":
+                summary['prev_menu_qty'] = approx_product_qty(sketch_store, prev_slice, store_idx, summary['top_menu'])
+
+    return summary
+
+# Fungsi untuk menghitung data agregasi chart dari sketch
+def aggregate(sketch_store, chart_id, bounds, selected_year, selected_month, stores=None, granularity=None):
+    """
+    Versi sketch dari fungsi aggregate_* di dashboard untuk chart di
+    SUPPORTED_CHARTS; kolom hasil sama dengan versi pandas.
+    """
+    start, end = (bounds[0], bounds[1]) if bounds is not None else (None, None)
+    day_slice, store_idx = select_cells(sketch_store, start, end, stores)
+
+    if chart_id == 'sales_trend':
+        days = sketch_store['days'][day_slice]
+        by_day = granularity == 'day' or (granularity is None and selected_month and selected_month != "All Months")
+        if granularity == 'year' or (granularity is None and selected_year == "All Time"):
+            period, period_sort = days.year.astype(str), days.year
+        elif by_day:
+            period = days.strftime('%Y-%m-%d')
+            period_sort = days.values.astype('datetime64[D]').astype(np.int64)
+        else:
+            period, period_sort = days.strftime('%Y-%m'), days.month
+
+        revenue = take_cells(sketch_store, 'revenue', day_slice, store_idx).sum(axis=1)
+        cells = cell_ids(sketch_store, day_slice, store_idx).reshape(len(days), len(store_idx))
+        labels = pd.DataFrame({'period': np.asarray(period), 'period_sort': np.asarray(period_sort)})
+        rows = []
+        for (label, sort_key), positions in labels.groupby(['period', 'period_sort']).indices.items():
+            rows.append({
+                'period': label,
+                'period_sort': sort_key,
+                'total_bill': float(revenue[positions].sum()),
+                'transaction_id': int(round(hll_estimate(hll_merge(sketch_store['hll'], cells[positions].ravel()))))
+            })
+        result = pd.DataFrame(rows, columns=['period', 'period_sort', 'total_bill', 'transaction_id'])
+        return result.sort_values('period_sort').reset_index(drop=True)
+
+    if chart_id == 'menu_performance':
+        top = approx_top_products(sketch_store, day_slice, store_idx, n=10)
+        return top[['product_detail', 'transaction_qty']]
+
+    if chart_id == 'revenue_customer_branch':
+        revenue = take_cells(sketch_store, 'revenue', day_slice, store_idx).sum(axis=0)
+        qty = take_cells(sketch_store, 'qty', day_slice, store_idx).sum(axis=0)
+        cells = cell_ids(sketch_store, day_slice, store_idx).reshape(-1, len(store_idx))
+        keep = qty > 0
+        customers = [
+            int(round(hll_estimate(hll_merge(sketch_store['hll'], cells[:, position]))))
+            for position in np.flatnonzero(keep)
+        ]
+        branch_stats = pd.DataFrame({
+            'Branch': sketch_store['stores'][store_idx[keep]],
+            'Revenue': revenue[keep],
+            'Customers': customers,
+            'Items_Sold': qty[keep].astype(np.int64)
+        })
+        branch_stats['Revenue_per_Customer'] = branch_stats['Revenue'] / branch_stats['Customers']
+        return branch_stats
+
+    raise KeyError(f"Chart tidak didukung mode aproksimasi: {chart_id}")
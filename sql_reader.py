@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+DEFAULT_CHUNK_SIZE = 50000
+
+# Tipe kolom yang didukung reader:
+#   'category'            -> pandas Categorical (kode int32 + kamus nilai)
+#   'datetime'            -> datetime64[ns]
+#   'float'               -> float64
+#   'int64'               -> int64 (Int64 nullable jika ada NULL)
+#   'Int8' / 'Int16' / .. -> integer nullable sempit
+NULLABLE_INT_DTYPES = {'Int8': np.int8, 'Int16': np.int16, 'Int32': np.int32, 'Int64': np.int64}
+
+# Fungsi untuk membuat buffer kolom yang sudah dialokasikan
+def _new_buffer(kind, capacity):
+    if kind == 'category':
+        return {'kind': kind, 'data': np.full(capacity, -1, dtype=np.int32), 'categories': {}}
+    if kind == 'datetime':
+        return {'kind': kind, 'data': np.empty(capacity, dtype='datetime64[ns]')}
+    if kind == 'float':
+        return {'kind': kind, 'data': np.empty(capacity, dtype=np.float64)}
+    if kind == 'int64':
+        return {'kind': kind, 'data': np.empty(capacity, dtype=np.int64), 'mask': np.zeros(capacity, dtype=bool)}
+    if kind in NULLABLE_INT_DTYPES:
+        return {'kind': kind, 'data': np.empty(capacity, dtype=NULLABLE_INT_DTYPES[kind]), 'mask': np.zeros(capacity, dtype=bool)}
+    raise ValueError(f"Tipe kolom tidak dikenal: {kind}")
+
+# Fungsi untuk memperbesar buffer jika jumlah baris melebihi perkiraan
+def _grow_buffer(buffer, capacity):
+    old_size = len(buffer['data'])
+    buffer['data'].resize(capacity, refcheck=False)
+    if buffer['kind'] == 'category':
+        buffer['data'][old_size:] = -1
+    if 'mask' in buffer:
+        buffer['mask'].resize(capacity, refcheck=False)
+
+# Fungsi untuk menulis satu chunk nilai ke buffer mulai dari posisi start
+def _write_chunk(buffer, values, start):
+    end = start + len(values)
+    kind = buffer['kind']
+
+    if kind == 'category':
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        categories = buffer['categories']
+        mapping = np.array([categories.setdefault(value, len(categories)) for value in uniques], dtype=np.int32)
+        buffer['data'][start:end] = np.where(codes >= 0, mapping[codes] if len(mapping) else -1, -1)
+    elif kind == 'datetime':
+        buffer['data'][start:end] = pd.to_datetime(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype='datetime64[ns]')
+    else:
+        numeric = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce')
+        if kind == 'float':
+            buffer['data'][start:end] = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            mask = numeric.isna().to_numpy()
+            buffer['mask'][start:end] = mask
+            buffer['data'][start:end] = numeric.fillna(0).to_numpy().astype(buffer['data'].dtype)
+
+# Fungsi untuk mengubah buffer menjadi kolom pandas final
+def _finish_buffer(buffer, rows):
+    kind = buffer['kind']
+    data = buffer['data']
+    data.resize(rows, refcheck=False)
+
+    if kind == 'category':
+        categories = pd.Index(list(buffer['categories']))
+        # Urutkan kategori seperti astype('category') agar urutan groupby konsisten
+        order = categories.argsort()
+        new_position = np.empty(len(order), dtype=np.int32)
+        new_position[order] = np.arange(len(order), dtype=np.int32)
+        codes = np.where(data >= 0, new_position[data] if len(order) else -1, -1).astype(np.int32)
+        return pd.Categorical.from_codes(codes, categories=categories[order])
+    if kind in ('datetime', 'float'):
+        return data
+
+    mask = buffer['mask']
+    mask.resize(rows, refcheck=False)
+    if kind == 'int64' and not mask.any():
+        return data
+    return pd.arrays.IntegerArray(data, mask)
+
+# Fungsi untuk membaca hasil query secara streaming ke dalam DataFrame ringkas
+def read_sql_compact(conn, query, params=None, column_kinds=None, expected_rows=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Membaca hasil query dengan server-side cursor (stream_results, di PyMySQL
+    memakai SSCursor) per chunk. Setiap chunk langsung dikonversi ke tipe
+    ringkas (lihat column_kinds) dan ditulis ke buffer kolom yang sudah
+    dialokasikan sebanyak expected_rows, sehingga tidak ada DataFrame object
+    berukuran penuh maupun buffer hasil query penuh di client. Puncak memori
+    kira-kira ukuran dataset final ditambah satu chunk.
+
+    Perkiraan ukuran baris jika dibaca dengan pd.read_sql biasa (dari chunk
+    pertama) disimpan di df.attrs['raw_bytes_per_row'].
+    """
+    column_kinds = column_kinds or {}
+    result = conn.execution_options(stream_results=True).execute(text(query), params or {})
+    columns = list(result.keys())
+
+    capacity = max(int(expected_rows or 0), chunk_size)
+    buffers = {col: _new_buffer(column_kinds.get(col, 'float'), capacity) for col in columns}
+    raw_bytes_per_row = None
+    rows = 0
+
+    try:
+        for chunk in result.partitions(chunk_size):
+            if raw_bytes_per_row is None:
+                sample = pd.DataFrame.from_records(chunk, columns=columns)
+                raw_bytes_per_row = float(sample.memory_usage(deep=True, index=False).sum()) / max(len(sample), 1)
+
+            if rows + len(chunk) > capacity:
+                capacity = max(capacity * 2, rows + len(chunk))
+                for buffer in buffers.values():
+                    _grow_buffer(buffer, capacity)
+
+            values_by_column = list(zip(*chunk))
+            for col, values in zip(columns, values_by_column):
+                _write_chunk(buffers[col], values, rows)
+            rows += len(chunk)
+    finally:
+        result.close()
+
+    df = pd.DataFrame({col: _finish_buffer(buffers[col], rows) for col in columns}, copy=False)
+    if raw_bytes_per_row is not None:
+        df.attrs['raw_bytes_per_row'] = raw_bytes_per_row
+    return df
@@ -0,0 +1,68 @@
+import os
+import sys
+import shutil
+import tempfile
+
+import pandas as pd
+import pytest
+
+# Snapshot, export, log dan database pengujian ditulis ke folder sementara.
+# Environment harus di-set sebelum modul aplikasi di-import karena path-nya
+# dibaca saat import (sama seperti loadtest.py).
+TEST_DIR = tempfile.mkdtemp(prefix="coffee-tests-")
+DATABASE_PATH = os.path.join(TEST_DIR, "coffeedw_test.db")
+os.environ["COFFEE_DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ["COFFEE_STORE_DIR"] = os.path.join(TEST_DIR, "store")
+os.environ["COFFEE_EXPORT_DIR"] = os.path.join(TEST_DIR, "exports")
+os.environ["COFFEE_PROFILE_LOG"] = os.path.join(TEST_DIR, "profile.jsonl")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import loadtest  # noqa: E402
+
+# Jumlah baris dan rentang hari data warehouse sintetis
+WAREHOUSE_ROWS = 20000
+WAREHOUSE_DAYS = 120
+
+
+# Data warehouse SQLite sintetis (struktur sama dengan hasil load_to_mysql), diisi ulang per test
+@pytest.fixture
+def warehouse():
+    import database
+
+    database.dispose_engine()
+    loadtest.seed_database(os.environ["COFFEE_DATABASE_URL"], WAREHOUSE_ROWS, WAREHOUSE_DAYS)
+    yield database.get_engine()
+    database.dispose_engine()
+
+
+# Folder snapshot kosong untuk setiap test
+@pytest.fixture
+def store_dir():
+    import data_store
+
+    shutil.rmtree(data_store.STORE_DIR, ignore_errors=True)
+    os.makedirs(data_store.STORE_DIR)
+    yield data_store.STORE_DIR
+    shutil.rmtree(data_store.STORE_DIR, ignore_errors=True)
+
+
+# Dataset dashboard (terurut per tanggal, kolom kategori) dari data sintetis tanpa database
+@pytest.fixture(scope="session")
+def sales():
+    import dashboard
+
+    raw = loadtest.generate_sales(WAREHOUSE_ROWS, "2023-01-01", WAREHOUSE_DAYS, seed=1)
+    timestamps = pd.to_datetime(raw['transaction_date'] + " " + raw['transaction_time'], format='%d/%m/%Y %H:%M:%S')
+    df = raw.rename(columns={'Total_Bill': 'total_bill', 'Size': 'size'}).assign(
+        transaction_date=timestamps,
+        year=timestamps.dt.year,
+        month=timestamps.dt.month,
+        month_name=raw['Month Name'],
+        day=timestamps.dt.day,
+        day_name=raw['Day Name'],
+        day_of_week=raw['Day of Week'],
+        hour=raw['Hour']
+    )[list(dashboard.COLUMN_SOURCES)]
+    df = dashboard.compact_dataset(df)
+    return df.sort_values('transaction_date', kind='mergesort', ignore_index=True)
+
@@ -0,0 +1,97 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+import api
+import dashboard
+import data_store
+import prerender
+
+
+# Service API di port acak dengan versi data tetap (tanpa database)
+@pytest.fixture
+def server(sales, store_dir, monkeypatch):
+    version = dashboard.get_snapshot_key("v1")
+    data_store.write_snapshot(sales, version)
+    monkeypatch.setattr(api, "current_version", lambda: version)
+    monkeypatch.setitem(api._state, 'df', None)
+    monkeypatch.setitem(api._state, 'prerender', (None, None))
+    monkeypatch.setitem(api._state, 'results', dashboard.new_figure_cache())
+    monkeypatch.setenv("COFFEE_API_QUIET", "1")
+
+    httpd = api.create_server("127.0.0.1", 0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield {'url': f"http://127.0.0.1:{httpd.server_address[1]}", 'version': version}
+    httpd.shutdown()
+    httpd.server_close()
+
+
+# Fungsi untuk mengirim GET dan mengembalikan (status, header, body JSON)
+def get(url, headers=None):
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            body = response.read()
+            return response.status, response.headers, json.loads(body) if body else None
+    except urllib.error.HTTPError as e:
+        body = e.read()
+        return e.code, e.headers, json.loads(body) if body else None
+
+
+def test_matching_etag_returns_304(server):
+    url = server['url'] + "/api/kpis?year=2023&month=March&store_location=Astoria"
+    status, headers, body = get(url)
+    assert status == 200 and body['version'] == server['version']
+
+    status, _, body = get(url, {'If-None-Match': headers['ETag']})
+    assert status == 304 and body is None
+
+    # URL lain punya ETag lain
+    status, _, _ = get(server['url'] + "/api/kpis?year=2023&month=April", {'If-None-Match': headers['ETag']})
+    assert status == 200
+
+
+def test_kpis_match_dashboard(server, sales):
+    filters = {'store_location': ["Astoria"]}
+    _, _, body = get(server['url'] + "/api/kpis?year=2023&month=March&store_location=Astoria")
+
+    df_filtered, df_previous = dashboard.filter_data_by_period(sales, "2023", "March", filters)
+    expected = dashboard.compute_kpis(df_filtered, df_previous, "2023", "March", filters)
+    assert body['kpis']['total_revenue'] == pytest.approx(expected['total_revenue'])
+    assert body['kpis']['top_menu'] == expected['top_menu']
+    assert body['kpis']['revenue_growth'] == pytest.approx(expected['revenue_growth'])
+
+
+def test_default_periods_are_served_from_prerender(server, sales, monkeypatch):
+    df = data_store.open_snapshot(server['version'])
+    prerender.save_prerender(server['version'], dashboard.render_default_periods(df))
+    expected_kpis = get(server['url'] + "/api/kpis?year=2023&month=April&comparison=last_year")[2]['kpis']
+
+    # Periode default dijawab tanpa membuka dataset
+    def no_dataset():
+        raise AssertionError("dataset tidak boleh dibuka")
+    monkeypatch.setattr(api, "get_dataset", no_dataset)
+
+    status, _, body = get(server['url'] + "/api/kpis?year=2023&month=April")
+    df_filtered, df_previous = dashboard.filter_data_by_period(sales, "2023", "April")
+    expected = dashboard.compute_kpis(df_filtered, df_previous, "2023", "April", period_store=dashboard.build_period_store(sales))
+    assert status == 200
+    assert body['kpis']['total_revenue'] == pytest.approx(expected['total_revenue'])
+    assert body['kpis']['revenue_growth'] == pytest.approx(expected['revenue_growth'])
+    assert expected_kpis['total_revenue'] == pytest.approx(expected['total_revenue'])
+
+    status, _, body = get(server['url'] + "/api/charts/menu_performance?year=2023&month=April")
+    data = dashboard.get_chart_data('menu_performance', df_filtered, "2023", "April")
+    assert status == 200
+    assert pd.DataFrame(body['data']).astype({'product_detail': str}).equals(data.astype({'product_detail': str}).reset_index(drop=True))
+
+
+def test_bad_requests(server):
+    assert get(server['url'] + "/api/charts/tidak_ada?year=2023")[0] == 404
+    assert get(server['url'] + "/api/kpis?year=abc")[0] == 400
+    assert get(server['url'] + "/api/kpis?year=2023&month=Maret")[0] == 400
@@ -0,0 +1,62 @@
+import itertools
+
+import pandas as pd
+import pytest
+
+import basket
+
+
+# Keranjang kecil: transaksi -> produk (produk yang sama bisa muncul di beberapa baris)
+BASKETS = {
+    1: ["Latte", "Croissant"],
+    2: ["Latte", "Croissant", "Croissant"],
+    3: ["Latte", "Scone"],
+    4: ["Chai", "Scone"],
+    5: ["Latte", "Croissant", "Scone"],
+    6: ["Chai"]
+}
+
+
+@pytest.fixture
+def baskets():
+    rows = [(transaction_id, product) for transaction_id, products in BASKETS.items() for product in products]
+    return pd.DataFrame({
+        'transaction_id': [row[0] for row in rows],
+        'product_detail': pd.Categorical([row[1] for row in rows])
+    })
+
+
+def test_affinity_matches_brute_force_counts(baskets):
+    rules = basket.product_affinity(baskets, min_transactions=1)
+    baskets_sets = [set(products) for products in BASKETS.values()]
+    n = len(baskets_sets)
+
+    expected = {}
+    for a, b in itertools.permutations(sorted(set(itertools.chain(*BASKETS.values()))), 2):
+        together = sum(a in items and b in items for items in baskets_sets)
+        if together == 0:
+            continue
+        count_a = sum(a in items for items in baskets_sets)
+        count_b = sum(b in items for items in baskets_sets)
+        expected[(a, b)] = (together, together / n, together / count_a, together / count_a / (count_b / n))
+
+    actual = {
+        (row.antecedent, row.consequent): (row.transactions, row.support, row.confidence, row.lift)
+        for row in rules.itertuples()
+    }
+    assert actual.keys() == expected.keys()
+    for key, values in expected.items():
+        assert actual[key] == pytest.approx(values), key
+    assert rules['lift'].is_monotonic_decreasing
+
+
+def test_min_transactions_and_top_pairs(baskets):
+    rules = basket.product_affinity(baskets, min_transactions=3)
+    assert set(zip(rules['antecedent'], rules['consequent'])) == {("Latte", "Croissant"), ("Croissant", "Latte")}
+
+    pairs = basket.top_pairs(rules)
+    assert pairs['pair'].tolist() == ["Croissant + Latte"]
+
+
+def test_empty_input_returns_rule_columns():
+    assert list(basket.product_affinity(pd.DataFrame()).columns) == basket.RULE_COLUMNS
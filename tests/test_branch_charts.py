@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dashboard
+
+
+# Fungsi untuk membuat statistik cabang sintetis dengan n cabang
+def many_branches(n):
+    rng = np.random.default_rng(0)
+    customers = rng.integers(50, 500, n)
+    revenue = customers * rng.uniform(3, 8, n)
+    return pd.DataFrame({
+        'Branch': [f"Store {i}" for i in range(n)],
+        'Revenue': revenue,
+        'Customers': customers,
+        'Items_Sold': customers * 2,
+        'Revenue_per_Customer': revenue / customers
+    })
+
+
+def test_branch_ranking_orders_by_revenue_with_shares(sales):
+    branch_stats = dashboard.aggregate_branch_stats(sales, "All Time", "All Months")
+    ranking = dashboard.build_branch_ranking(branch_stats)
+
+    revenue = sales.groupby('store_location', observed=True)['total_bill'].sum().sort_values(ascending=False)
+    assert ranking['Branch'].tolist() == revenue.index.tolist()
+    assert ranking['Rank'].tolist() == list(range(1, len(revenue) + 1))
+    assert ranking['Share'].sum() == pytest.approx(1.0)
+    assert ranking['Customers'].tolist() == [sales.loc[sales['store_location'] == branch, 'transaction_id'].nunique() for branch in ranking['Branch']]
+
+
+def test_revenue_customer_figure_uses_one_trace_for_all_branches():
+    figure = dashboard.build_revenue_customer_branch_figure(many_branches(250), "2023", "All Months")
+    scatter = [trace for trace in figure.data if len(trace.x) == 250]
+
+    assert len(scatter) == 1
+    # Di atas MAX_BRANCH_LABELS nama cabang cukup di hover
+    assert scatter[0].mode == 'markers'
+    # Palet dipakai bergiliran sehingga setiap cabang mendapat warna
+    assert len(scatter[0].marker.color) == 250
+
+
+def test_category_chart_keeps_top_branches_and_one_trace_per_category():
+    n = dashboard.MAX_CATEGORY_BRANCHES + 5
+    rows = [
+        {'store_location': f"Store {i}", 'product_category': category, 'total_bill': float(i + 1), 'transaction_qty': 1}
+        for i in range(n) for category in ("Coffee", "Tea", "Bakery")
+    ]
+    figure = dashboard.build_category_by_branch_figure(pd.DataFrame(rows), "2023", "All Months")
+
+    assert len(figure.data) == 3
+    assert list(figure.data[0].x) == [f"Store {i}" for i in range(n - 1, n - 1 - dashboard.MAX_CATEGORY_BRANCHES, -1)]
+    assert f"Top {dashboard.MAX_CATEGORY_BRANCHES} dari {n}" in figure.layout.title.text
+
+
+def test_empty_branch_stats_use_the_shared_empty_chart():
+    figure = dashboard.build_revenue_customer_branch_figure(pd.DataFrame(), "2023", "March")
+    expected = dashboard.create_empty_chart("Revenue vs Customer per Branch", "No data available", 400, hide_axes=True)
+    assert figure.to_plotly_json() == expected.to_plotly_json()
+    assert figure.layout.xaxis.visible is False
@@ -0,0 +1,18 @@
+import plotly.io as pio
+
+import dashboard
+
+
+def test_concurrent_build_matches_sequential_build(sales, monkeypatch):
+    monkeypatch.setattr(dashboard, "CHART_WORKERS", 4)
+    df_filtered, _ = dashboard.filter_data_by_period(sales, "2023", "March")
+    chart_ids = list(dashboard.CHARTS)
+
+    figures, sizes = dashboard.build_charts(chart_ids, df_filtered, "2023", "March")
+
+    assert list(figures) == chart_ids
+    assert sizes == {chart_id: dashboard.estimate_cache_size(figures[chart_id]) for chart_id in chart_ids}
+    for chart_id in chart_ids:
+        expected = dashboard.create_chart(chart_id, df_filtered, "2023", "March")
+        assert pio.to_json(figures[chart_id], validate=False) == pio.to_json(expected, validate=False)
+
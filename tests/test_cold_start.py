@@ -0,0 +1,21 @@
+import data_store
+import dashboard
+
+
+def test_cold_start_serves_last_snapshot_when_database_is_down(sales, store_dir, monkeypatch):
+    version = dashboard.get_snapshot_key("v1")
+    data_store.write_snapshot(sales, version)
+    monkeypatch.setattr(dashboard, "create_connection", lambda: None)
+
+    df = dashboard.fetch_data()
+    assert df is not None
+    assert len(df) == len(sales)
+    assert df.attrs['snapshot_version'] == version
+
+
+def test_snapshot_with_other_columns_is_ignored(sales, store_dir, monkeypatch):
+    # Snapshot dengan susunan kolom lain (kunci berbeda) tidak boleh dipakai chart saat ini
+    data_store.write_snapshot(sales, "v1-00000000")
+    monkeypatch.setattr(dashboard, "create_connection", lambda: None)
+
+    assert dashboard.fetch_data() is None
@@ -0,0 +1,20 @@
+import pandas as pd
+
+import dashboard
+
+
+def test_compact_dataset_shrinks_rows_without_changing_values(sales):
+    raw = sales.astype({col: object for col in dashboard.CATEGORICAL_COLUMNS if col in sales.columns})
+    raw = raw.astype({col: 'int64' for col in dashboard.NARROW_INT_COLUMNS if col in raw.columns})
+
+    compact = dashboard.compact_dataset(raw.copy())
+    report = compact.attrs['memory_report']
+    assert report['bytes_per_row_after'] < report['bytes_per_row_before']
+    assert isinstance(compact['store_location'].dtype, pd.CategoricalDtype)
+    assert str(compact['hour'].dtype) == 'Int8'
+    assert compact['total_bill'].dtype == 'float64'
+    pd.testing.assert_frame_equal(
+        compact.astype({col: object for col in dashboard.CATEGORICAL_COLUMNS if col in compact.columns}),
+        raw,
+        check_dtype=False
+    )
@@ -0,0 +1,85 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_store
+
+
+def make_frame(rows=200000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'transaction_id': np.arange(rows, dtype=np.int64),
+        'total_bill': rng.random(rows),
+        'store_location': pd.Categorical(rng.choice(["Astoria", "Lower Manhattan"], rows))
+    })
+    df.attrs['watermark'] = {'rows': rows, 'max_transaction_id': rows - 1}
+    return df
+
+
+# Fungsi untuk menjalankan fungsi yang sama di beberapa thread sekaligus
+def run_concurrently(target, n_threads=4):
+    errors = []
+    barrier = threading.Barrier(n_threads)
+
+    def run():
+        try:
+            barrier.wait()
+            target()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_snapshot_roundtrip_keeps_values_categories_and_attrs(store_dir):
+    df = make_frame(1000)
+    data_store.write_snapshot(df, "v1", store_dir)
+
+    loaded = data_store.open_snapshot("v1", store_dir)
+    pd.testing.assert_frame_equal(loaded, df)
+    assert isinstance(loaded['store_location'].dtype, pd.CategoricalDtype)
+    assert loaded.attrs['watermark'] == df.attrs['watermark']
+    assert data_store.current_version(store_dir) == "v1"
+
+
+def test_concurrent_writers_of_same_version_do_not_collide(store_dir):
+    df = make_frame()
+    for _ in range(3):
+        errors = run_concurrently(lambda: data_store.write_snapshot(df, "race-v", store_dir))
+        assert errors == []
+        pd.testing.assert_frame_equal(data_store.open_snapshot("race-v", store_dir), df)
+
+    # Tidak ada file sementara yang tertinggal
+    assert sorted(os.listdir(store_dir)) == ["CURRENT", os.path.basename(data_store.snapshot_path("race-v", store_dir))]
+
+
+def test_ensure_snapshot_builds_each_version_once(store_dir):
+    df = make_frame(5000)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return df
+
+    errors = run_concurrently(lambda: data_store.ensure_snapshot("v7", build, store_dir), n_threads=6)
+    assert errors == []
+    assert len(builds) == 1
+    pd.testing.assert_frame_equal(data_store.ensure_snapshot("v7", build, store_dir), df)
+    assert len(builds) == 1
+
+
+def test_cleanup_keeps_latest_versions(store_dir):
+    df = make_frame(100)
+    for number, version in enumerate(["v1", "v2", "v3"]):
+        path = data_store.write_snapshot(df, version, store_dir)
+        os.utime(path, (number, number))
+
+    assert not data_store.has_snapshot("v1", store_dir)
+    assert data_store.has_snapshot("v2", store_dir) and data_store.has_snapshot("v3", store_dir)
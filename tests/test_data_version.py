@@ -0,0 +1,37 @@
+from sqlalchemy import create_engine
+
+import data_version
+
+
+def new_engine():
+    return create_engine("sqlite://")
+
+
+def test_read_version_without_table_returns_none():
+    with new_engine().connect() as conn:
+        assert data_version.read_version(conn) is None
+
+
+def test_bump_version_tracks_last_full_version():
+    engine = new_engine()
+    with engine.begin() as conn:
+        data_version.ensure_table(conn)
+        data_version.bump_version(conn, data_version.CHANGE_FULL, 100)
+        data_version.bump_version(conn, data_version.CHANGE_APPEND, 10)
+        data_version.bump_version(conn, data_version.CHANGE_APPEND, 5)
+
+    with engine.connect() as conn:
+        info = data_version.read_version(conn)
+    assert info == {'version': 3, 'last_full_version': 1, 'change_kind': data_version.CHANGE_APPEND}
+
+    # Cache versi 1 dan 2 cukup mengambil baris baru; cache tanpa versi harus full reload
+    assert data_version.is_append_since(info, 1)
+    assert data_version.is_append_since(info, 2)
+    assert not data_version.is_append_since(info, None)
+
+    with engine.begin() as conn:
+        data_version.bump_version(conn, data_version.CHANGE_FULL, 7)
+    with engine.connect() as conn:
+        info = data_version.read_version(conn)
+    assert info['version'] == 4 and info['last_full_version'] == 4
+    assert not data_version.is_append_since(info, 3)
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import text
+
+import database
+
+
+@pytest.fixture
+def fresh_engine():
+    database.dispose_engine()
+    yield
+    database.dispose_engine()
+
+
+def test_get_engine_is_shared_across_threads(fresh_engine):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        engines = list(pool.map(lambda _: database.get_engine(), range(32)))
+
+    assert len({id(engine) for engine in engines}) == 1
+    with engines[0].connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_connections_are_reused_from_the_pool(fresh_engine):
+    engine = database.get_engine()
+    created = database.pool_metrics()['connections_created']
+    for _ in range(10):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    metrics = database.pool_metrics()
+    assert metrics['checkouts'] >= 10
+    assert metrics['connections_created'] - created <= 1
+
+
+def test_failed_connection_is_not_cached(fresh_engine, monkeypatch, tmp_path):
+    good_url = database.get_settings()['url']
+    database.dispose_engine()
+
+    # Folder yang tidak ada membuat SQLite gagal membuka file database
+    monkeypatch.setenv("COFFEE_DATABASE_URL", f"sqlite:///{tmp_path / 'missing' / 'db.sqlite'}")
+    with pytest.raises(Exception):
+        database.get_engine()
+    assert database._engine is None
+
+    monkeypatch.setenv("COFFEE_DATABASE_URL", good_url)
+    assert database.get_engine() is not None
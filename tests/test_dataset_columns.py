@@ -0,0 +1,27 @@
+import re
+
+import dashboard
+
+
+def test_dataset_columns_cover_every_chart():
+    columns = set(dashboard.get_dataset_columns())
+    for chart_id, chart in dashboard.CHARTS.items():
+        assert set(chart['columns']) <= columns, chart_id
+    assert set(dashboard.BASE_COLUMNS) <= columns
+    assert set(dashboard.FILTER_COLUMNS) <= columns
+
+
+def test_dataset_query_selects_only_needed_columns_without_order_by():
+    columns = dashboard.get_dataset_columns()
+    query = dashboard.get_dataset_query(columns)
+    assert "ORDER BY" not in query.upper()
+    for col, source in dashboard.COLUMN_SOURCES.items():
+        assert bool(re.search(re.escape(source) + r"\b", query)) == (col in columns), col
+
+
+def test_query_dataset_returns_date_sorted_compact_rows(warehouse):
+    with warehouse.connect() as conn:
+        df = dashboard.query_dataset(conn)
+    assert list(df.columns) == dashboard.get_dataset_columns()
+    assert df['transaction_date'].is_monotonic_increasing
+    assert str(df['store_location'].dtype) == 'category'
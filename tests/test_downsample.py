@@ -0,0 +1,25 @@
+import numpy as np
+
+import downsample
+
+
+def test_lttb_keeps_endpoints_and_threshold():
+    x = np.arange(1000)
+    y = np.sin(x / 30) * 100 + x
+    selected = downsample.lttb(x, y, 100)
+
+    assert len(selected) == 100
+    assert selected[0] == 0 and selected[-1] == 999
+    assert (np.diff(selected) > 0).all()
+
+
+def test_lttb_keeps_spikes():
+    y = np.zeros(500)
+    y[137], y[402] = 50, -50
+    selected = downsample.lttb(np.arange(500), y, 20)
+    assert 137 in selected and 402 in selected
+
+
+def test_short_series_is_returned_as_is():
+    assert np.array_equal(downsample.lttb([1, 2, 3], [5, 6, 7], 10), np.arange(3))
+    assert np.array_equal(downsample.lttb(np.arange(10), np.arange(10), 2), np.arange(10))
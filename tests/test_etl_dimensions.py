@@ -0,0 +1,83 @@
+import datetime
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+import data_version
+import etl_script
+import incremental
+import loadtest
+import refresh
+
+
+# Fungsi untuk menghitung revenue fact_sales setelah join ke kedua dimensi
+def joined_revenue(conn):
+    return pd.read_sql(text("""
+        SELECT SUM(f.total_bill) AS revenue FROM fact_sales f
+        JOIN dim_product p ON f.product_id = p.product_id
+        JOIN dim_store s ON f.store_id = s.store_id
+    """), conn)['revenue'][0]
+
+
+def test_new_dimension_rows_skips_existing_keys(warehouse):
+    rows = [
+        {'store_id': 3, 'store_location': "Astoria"},
+        {'store_id': 9, 'store_location': "Brooklyn"},
+        {'store_id': 9, 'store_location': "Brooklyn"}
+    ]
+    with warehouse.connect() as conn:
+        new_rows = etl_script.new_dimension_rows(conn, 'dim_store', rows, 'store_id')
+    assert new_rows.to_dict('records') == [{'store_id': 9, 'store_location': "Brooklyn"}]
+
+
+def test_upload_with_known_products_does_not_duplicate_dimensions(warehouse, tmp_path):
+    from streamlit.testing.v1 import AppTest
+
+    with warehouse.connect() as conn:
+        watermark = incremental.fact_sales_watermark(conn)
+        products_before = conn.execute(text("SELECT COUNT(*) FROM dim_product")).scalar()
+        stores_before = conn.execute(text("SELECT COUNT(*) FROM dim_store")).scalar()
+
+    batch_path = tmp_path / "batch.csv"
+    loadtest.generate_sales(200, datetime.date.today(), 1, seed=7, first_transaction_id=watermark['max_transaction_id'] + 1).to_csv(batch_path, index=False)
+    at = AppTest.from_string(loadtest.ETL_BATCH_SCRIPT, default_timeout=600)
+    at.session_state['loadtest_batch'] = str(batch_path)
+    at.run()
+    # Pre-render setelah load selesai sebelum database fixture dibuang
+    refresh.wait()
+    assert not at.exception
+
+    with warehouse.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM dim_product")).scalar() == products_before
+        assert conn.execute(text("SELECT COUNT(*) FROM dim_store")).scalar() == stores_before
+        # Join dimensi tidak menggandakan baris fakta
+        joined = joined_revenue(conn)
+        total = conn.execute(text("SELECT SUM(total_bill) FROM fact_sales")).scalar()
+    assert joined == total
+
+
+def test_existing_duplicates_are_removed_and_keys_made_unique(warehouse):
+    with warehouse.begin() as conn:
+        conn.execute(text("INSERT INTO dim_product SELECT * FROM dim_product WHERE product_id <= 3"))
+        conn.execute(text("INSERT INTO dim_store SELECT * FROM dim_store"))
+        products = conn.execute(text("SELECT COUNT(DISTINCT product_id) FROM dim_product")).scalar()
+        version_before = data_version.read_version(conn)
+        assert joined_revenue(conn) > conn.execute(text("SELECT SUM(total_bill) FROM fact_sales")).scalar()
+
+    assert etl_script.ensure_dimension_keys(warehouse) == 3 + len(loadtest.STORES)
+    # Sudah unik: pemanggilan berikutnya tidak melakukan apa-apa
+    assert etl_script.ensure_dimension_keys(warehouse) == 0
+
+    with warehouse.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM dim_product")).scalar() == products
+        assert joined_revenue(conn) == pytest.approx(conn.execute(text("SELECT SUM(total_bill) FROM fact_sales")).scalar())
+        # Snapshot lama berisi hasil join ganda, jadi versi naik sebagai perubahan penuh
+        version_after = data_version.read_version(conn)
+        assert version_after['version'] == version_before['version'] + 1
+        assert not data_version.is_append_since(version_after, version_before['version'])
+
+    with pytest.raises(IntegrityError):
+        with warehouse.begin() as conn:
+            conn.execute(text("INSERT INTO dim_store SELECT * FROM dim_store"))
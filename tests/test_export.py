@@ -0,0 +1,63 @@
+import os
+import time
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import dashboard
+import export
+
+
+def test_raw_export_matches_filtered_rows(warehouse, tmp_path):
+    with warehouse.connect() as conn:
+        df = dashboard.query_dataset(conn)
+    # Rentang 28 hari di tengah data warehouse sintetis
+    start = df['transaction_date'].min().normalize() + pd.Timedelta(days=30)
+    end = start + pd.Timedelta(days=28)
+    expected = df[(df['transaction_date'] >= start) & (df['transaction_date'] < end) & (df['store_location'] == "Astoria")]
+    expected = expected.sort_values('transaction_id', ignore_index=True)
+    query, params, column_kinds = dashboard.build_export_query(start, end, {'store_location': ["Astoria"]})
+
+    for fmt in export.FORMATS:
+        path = str(tmp_path / f"transaksi.{fmt}")
+        progress = {'rows': 0}
+        with warehouse.connect() as conn:
+            # Chunk kecil agar file ditulis dalam banyak chunk / row group
+            chunks = export.iter_query_chunks(conn, query, params, column_kinds, chunk_size=500)
+            rows = export.write_export(chunks, path, fmt, export.arrow_schema(column_kinds), progress)
+
+        result = pd.read_csv(path) if fmt == 'csv' else pd.read_parquet(path)
+        assert rows == len(expected) == len(result) == progress['rows'] > 0
+        assert sorted(result['transaction_id']) == expected['transaction_id'].tolist()
+        assert result['total_bill'].sum() == pytest.approx(expected['total_bill'].sum())
+        if fmt == 'parquet':
+            assert pq.ParquetFile(path).num_row_groups > 1
+        assert not [name for name in os.listdir(tmp_path) if ".tmp-" in name]
+
+
+def test_empty_parquet_export_keeps_schema(tmp_path):
+    column_kinds = {'transaction_id': 'int64', 'store_location': 'category'}
+    path = str(tmp_path / "kosong.parquet")
+    rows = export.write_export(iter([]), path, 'parquet', export.arrow_schema(column_kinds))
+
+    assert rows == 0
+    assert pq.read_schema(path).names == list(column_kinds)
+
+
+def test_chart_data_export_round_trips(sales, tmp_path):
+    data = dashboard.get_chart_data('menu_performance', sales, "2023", "All Months")
+    path = str(tmp_path / "menu.csv")
+    export.write_export(export.iter_frame_chunks(data, chunk_size=3), path, 'csv')
+    pd.testing.assert_frame_equal(pd.read_csv(path), data.astype({'product_detail': str}).reset_index(drop=True), check_dtype=False)
+
+
+def test_cleanup_removes_only_old_exports(tmp_path):
+    old_path, new_path = tmp_path / "old.csv", tmp_path / "new.csv"
+    old_path.write_text("x")
+    new_path.write_text("x")
+    two_days_ago = time.time() - 48 * 3600
+    os.utime(old_path, (two_days_ago, two_days_ago))
+
+    export.cleanup_exports(str(tmp_path))
+    assert not old_path.exists() and new_path.exists()
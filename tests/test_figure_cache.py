@@ -0,0 +1,72 @@
+import pandas as pd
+
+import dashboard
+
+
+# Fungsi untuk membuat hasil chart berukuran tertentu (bytes)
+def sized_frame(size):
+    return pd.DataFrame({'x': range(size // 8)}, dtype='int64')
+
+
+def test_hit_returns_the_stored_result_without_rebuilding():
+    cache = dashboard.new_figure_cache()
+    builds = []
+
+    def build():
+        builds.append(True)
+        return sized_frame(800)
+
+    first = dashboard.get_cached_chart(('menu', "2023", "March", "v1"), build, cache)
+    second = dashboard.get_cached_chart(('menu', "2023", "March", "v1"), build, cache)
+
+    assert second is first
+    assert len(builds) == 1
+    assert cache['hits'] == 1 and cache['misses'] == 1
+
+
+def test_new_data_version_is_a_new_entry():
+    cache = dashboard.new_figure_cache()
+    dashboard.get_cached_chart(('menu', "2023", "March", "v1"), lambda: sized_frame(800), cache)
+    dashboard.get_cached_chart(('menu', "2023", "March", "v2"), lambda: sized_frame(800), cache)
+    assert len(cache['entries']) == 2
+
+
+def test_result_without_data_version_is_not_cached():
+    cache = dashboard.new_figure_cache()
+    dashboard.get_cached_chart(('menu', "2023", "March", None), lambda: sized_frame(800), cache)
+    assert len(cache['entries']) == 0
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    frame_bytes = dashboard.estimate_cache_size(sized_frame(80000))
+    # Cukup untuk dua entri
+    monkeypatch.setattr(dashboard, "FIGURE_CACHE_MAX_MB", frame_bytes * 2.5 / 1024 ** 2)
+    cache = dashboard.new_figure_cache()
+
+    for key in ("a", "b"):
+        dashboard.get_cached_chart((key, "v1"), lambda: sized_frame(80000), cache)
+    # "a" dipakai lagi sehingga "b" menjadi yang paling lama tidak dipakai
+    dashboard.get_cached_chart(("a", "v1"), lambda: sized_frame(80000), cache)
+    dashboard.get_cached_chart(("c", "v1"), lambda: sized_frame(80000), cache)
+
+    assert list(cache['entries']) == [("a", "v1"), ("c", "v1")]
+    assert cache['bytes'] == sum(size for _, size in cache['entries'].values())
+    assert cache['bytes'] <= dashboard.FIGURE_CACHE_MAX_MB * 1024 ** 2
+
+
+def test_result_larger_than_the_cache_is_not_stored(monkeypatch):
+    monkeypatch.setattr(dashboard, "FIGURE_CACHE_MAX_MB", 1 / 1024)
+    cache = dashboard.new_figure_cache()
+    dashboard.get_cached_chart(("big", "v1"), lambda: sized_frame(80000), cache)
+    assert len(cache['entries']) == 0 and cache['bytes'] == 0
+
+
+def test_figure_size_is_kept_in_the_cache_entry(sales):
+    cache = dashboard.new_figure_cache()
+    df_filtered, _ = dashboard.filter_data_by_period(sales, "2023", "March")
+    figure, size = dashboard.create_chart_entry('sales_trend', df_filtered, "2023", "March", data_version="v1", cache=cache)
+
+    assert size == dashboard.get_payload_bytes(figure)
+    assert not hasattr(figure, '_payload_bytes')
+    # Cache hit mengembalikan ukuran yang tersimpan tanpa serialisasi ulang
+    assert dashboard.create_chart_entry('sales_trend', df_filtered, "2023", "March", data_version="v1", cache=cache) == (figure, size)
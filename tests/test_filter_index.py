@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+import dashboard
+
+
+# Versi mask boolean dari select_rows (acuan untuk index posisi baris)
+def mask_rows(df, start, end, filters):
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df['transaction_date'] >= start
+    if end is not None:
+        mask &= df['transaction_date'] < end
+    for col, values in filters.items():
+        if values:
+            mask &= df[col].isin(values)
+    return df[mask]
+
+
+@pytest.mark.parametrize("start, end, filters", [
+    ("2023-02-01", "2023-03-01", {'store_location': ["Astoria"]}),
+    ("2023-01-15", "2023-04-10", {'store_location': ["Astoria", "Lower Manhattan"], 'product_category': ["Coffee", "Tea"]}),
+    (None, None, {'product_detail': ["Latte", "Scone", "Tidak Ada"]}),
+    ("2023-03-01", "2023-04-01", {'store_location': ["Hell's Kitchen"], 'product_category': ["Coffee"], 'product_detail': ["Latte"]}),
+    ("2023-03-01", "2023-04-01", {'store_location': [], 'product_category': ["Bakery"]}),
+    ("2023-02-01", "2023-03-01", {'store_location': ["Tidak Ada"]})
+])
+def test_filter_index_equals_boolean_mask(sales, start, end, filters):
+    result = dashboard.select_rows(sales, start, end, filters)
+    expected = mask_rows(sales, start, end, filters)
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+def test_date_range_filter_narrows_the_selected_period(sales):
+    filters = {'date_range': (pd.Timestamp("2023-03-05"), pd.Timestamp("2023-03-11")), 'store_location': ["Astoria"]}
+    df_filtered, df_previous = dashboard.filter_data_by_period(sales, "2023", "March", filters)
+
+    expected = mask_rows(sales, "2023-03-05", "2023-03-12", {'store_location': ["Astoria"]})
+    previous = mask_rows(sales, "2023-02-26", "2023-03-05", {'store_location': ["Astoria"]})
+    pd.testing.assert_frame_equal(df_filtered.reset_index(drop=True), expected.reset_index(drop=True))
+    pd.testing.assert_frame_equal(df_previous.reset_index(drop=True), previous.reset_index(drop=True))
@@ -0,0 +1,95 @@
+import pandas as pd
+from sqlalchemy import text
+
+import dashboard
+import data_version
+import incremental
+
+
+# Fungsi untuk menambah baris fact_sales baru (salinan baris lama dengan transaction_id baru)
+def append_fact_sales(engine, rows, change_kind=data_version.CHANGE_APPEND):
+    with engine.begin() as conn:
+        offset = incremental.fact_sales_watermark(conn)['max_transaction_id']
+        conn.execute(text("""
+            INSERT INTO fact_sales (transaction_id, time_id, product_id, store_id, transaction_qty, unit_price, total_bill)
+            SELECT transaction_id + :offset, time_id, product_id, store_id, transaction_qty, unit_price, total_bill
+            FROM fact_sales WHERE transaction_id <= :rows
+        """), {'offset': offset, 'rows': rows})
+        data_version.bump_version(conn, change_kind, rows)
+
+
+# Fungsi untuk menyamakan urutan baris dan kategori sebelum dua dataset dibandingkan
+def normalize(df):
+    df = df.astype({col: str for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+    return df.sort_values(list(df.columns), ignore_index=True)
+
+
+def current_key(engine):
+    with engine.connect() as conn:
+        return dashboard.get_snapshot_key(f"v{data_version.read_version(conn)['version']}")
+
+
+def test_append_rows_keeps_categories_and_attrs():
+    base = pd.DataFrame({'store': pd.Categorical(["Astoria", "Astoria"]), 'qty': [1, 2]})
+    base.attrs['watermark'] = {'rows': 2, 'max_transaction_id': 2}
+    delta = pd.DataFrame({'store': pd.Categorical(["Lower Manhattan"]), 'qty': [3]})
+
+    merged = incremental.append_rows(base, delta)
+    assert isinstance(merged['store'].dtype, pd.CategoricalDtype)
+    assert merged['store'].tolist() == ["Astoria", "Astoria", "Lower Manhattan"]
+    assert merged['qty'].tolist() == [1, 2, 3]
+    assert merged.attrs['watermark'] == base.attrs['watermark']
+
+
+def test_is_append_only_detects_append_and_delete(warehouse):
+    with warehouse.connect() as conn:
+        watermark = incremental.fact_sales_watermark(conn)
+
+    append_fact_sales(warehouse, 100)
+    with warehouse.connect() as conn:
+        assert incremental.is_append_only(conn, watermark)
+
+    with warehouse.begin() as conn:
+        conn.execute(text("DELETE FROM fact_sales WHERE transaction_id = 1"))
+    with warehouse.connect() as conn:
+        assert not incremental.is_append_only(conn, watermark)
+
+
+def test_incremental_snapshot_equals_full_reload(warehouse, store_dir, monkeypatch):
+    dashboard.open_dataset(current_key(warehouse), warehouse)
+    append_fact_sales(warehouse, 500)
+
+    calls = []
+    original_query = dashboard.query_dataset
+
+    def spy_query(conn, since_transaction_id=None, expected_rows=None):
+        calls.append(since_transaction_id)
+        return original_query(conn, since_transaction_id, expected_rows)
+
+    monkeypatch.setattr(dashboard, "query_dataset", spy_query)
+    incremental_df = dashboard.open_dataset(current_key(warehouse), warehouse)
+    monkeypatch.undo()
+
+    # Hanya baris di atas watermark snapshot lama yang di-query
+    assert len(calls) == 1 and calls[0] is not None
+
+    with warehouse.connect() as conn:
+        full_df = dashboard.query_dataset(conn)
+    assert incremental_df['transaction_date'].is_monotonic_increasing
+    pd.testing.assert_frame_equal(normalize(incremental_df), normalize(full_df))
+
+
+def test_full_change_triggers_full_reload(warehouse, store_dir, monkeypatch):
+    dashboard.open_dataset(current_key(warehouse), warehouse)
+    append_fact_sales(warehouse, 50, data_version.CHANGE_FULL)
+
+    calls = []
+    original_query = dashboard.query_dataset
+
+    def spy_query(conn, since_transaction_id=None, expected_rows=None):
+        calls.append(since_transaction_id)
+        return original_query(conn, since_transaction_id, expected_rows)
+
+    monkeypatch.setattr(dashboard, "query_dataset", spy_query)
+    dashboard.open_dataset(current_key(warehouse), warehouse)
+    assert calls == [None]
@@ -0,0 +1,26 @@
+import pytest
+import streamlit
+from streamlit.runtime import Runtime
+
+import loadtest
+
+
+def test_shared_test_runtime_restores_streamlit_methods():
+    original = (Runtime.__dict__['instance'], Runtime.__dict__['exists'])
+    with loadtest.shared_test_runtime():
+        assert Runtime.__dict__['instance'] is not original[0]
+    assert (Runtime.__dict__['instance'], Runtime.__dict__['exists']) == original
+
+    with pytest.raises(ValueError):
+        with loadtest.shared_test_runtime():
+            raise ValueError("sesi gagal")
+    assert (Runtime.__dict__['instance'], Runtime.__dict__['exists']) == original
+
+
+def test_shared_test_runtime_refuses_untested_streamlit(monkeypatch):
+    original = Runtime.__dict__['instance']
+    monkeypatch.setattr(streamlit, "__version__", "1.40.0")
+    with pytest.raises(RuntimeError, match="1.40.0"):
+        with loadtest.shared_test_runtime():
+            pass
+    assert Runtime.__dict__['instance'] is original
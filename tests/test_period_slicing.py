@@ -0,0 +1,30 @@
+import pandas as pd
+import pytest
+
+import dashboard
+
+
+# Versi mask boolean dari filter periode (acuan untuk slicing searchsorted)
+def mask_period(df, start, end):
+    return df[(df['transaction_date'] >= start) & (df['transaction_date'] < end)]
+
+
+@pytest.mark.parametrize("selected_year, selected_month", [
+    ("2023", "All Months"),
+    ("2023", "February"),
+    ("2023", "April"),
+    ("2022", "December")
+])
+def test_period_slice_equals_boolean_mask(sales, selected_year, selected_month):
+    start, end, prev_start, prev_end = dashboard.get_period_bounds(selected_year, selected_month)
+    df_filtered, df_previous = dashboard.filter_data_by_period(sales, selected_year, selected_month)
+
+    pd.testing.assert_frame_equal(df_filtered.reset_index(drop=True), mask_period(sales, start, end).reset_index(drop=True))
+    pd.testing.assert_frame_equal(df_previous.reset_index(drop=True), mask_period(sales, prev_start, prev_end).reset_index(drop=True))
+
+
+def test_all_time_returns_everything_without_previous(sales):
+    df_filtered, df_previous = dashboard.filter_data_by_period(sales, "All Time")
+    assert len(df_filtered) == len(sales)
+    assert df_previous.empty
+
@@ -0,0 +1,38 @@
+import pytest
+
+import dashboard
+
+
+@pytest.mark.parametrize("selected_year, selected_month, comparison", [
+    ("2023", "February", dashboard.COMPARISON_PREVIOUS),
+    ("2023", "March", dashboard.COMPARISON_PREVIOUS),
+    ("2023", "April", dashboard.COMPARISON_PREVIOUS),
+    ("2023", "March", dashboard.COMPARISON_LAST_YEAR),
+    ("2023", "All Months", dashboard.COMPARISON_PREVIOUS)
+])
+def test_period_store_kpis_equal_compute_from_rows(sales, selected_year, selected_month, comparison):
+    df_filtered, df_previous = dashboard.filter_data_by_period(sales, selected_year, selected_month, comparison=comparison)
+
+    expected = dashboard.compute_kpis(df_filtered, df_previous, selected_year, selected_month, comparison=comparison)
+    actual = dashboard.compute_kpis(
+        df_filtered, df_previous, selected_year, selected_month, comparison=comparison,
+        period_store=dashboard.build_period_store(sales)
+    )
+
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, float):
+            assert actual[key] == pytest.approx(value), key
+        else:
+            assert actual[key] == value, key
+
+
+def test_period_store_totals_match_rows(sales):
+    store = dashboard.build_period_store(sales)
+    march = sales[(sales['transaction_date'] >= "2023-03-01") & (sales['transaction_date'] < "2023-04-01")]
+
+    assert store['revenue'][(2023, 3)] == pytest.approx(march['total_bill'].sum())
+    assert store['customers'][(2023, 3)] == march['transaction_id'].nunique()
+    assert store['revenue'][(2023, None)] == pytest.approx(sales['total_bill'].sum())
+    latte = march.loc[march['product_detail'] == "Latte", 'transaction_qty'].sum()
+    assert store['product_qty'].get((2023, 3, "Latte"), 0) == latte
@@ -0,0 +1,47 @@
+import json
+
+import dashboard
+import profiler
+
+
+def test_disabled_profile_records_nothing(tmp_path):
+    log_path = tmp_path / "profile.jsonl"
+    profile = profiler.start_profile(enabled=False)
+    with profiler.step(profile, "agregasi") as record:
+        record['rows_out'] = 3
+
+    profiler.write_log(profile, log_path=str(log_path))
+    assert profile is None
+    assert profiler.summarize(profile) == []
+    assert not log_path.exists()
+
+
+def test_steps_are_summarized_and_logged(tmp_path):
+    log_path = tmp_path / "logs" / "profile.jsonl"
+    profile = profiler.start_profile()
+    with profiler.step(profile, "agregasi", rows_in=10) as record:
+        record['rows_out'] = 3
+
+    rows = profiler.summarize(profile)
+    assert rows[0]['Langkah'] == "agregasi"
+    assert rows[0]['Baris Masuk'] == 10 and rows[0]['Baris Keluar'] == 3
+
+    profiler.write_log(profile, context={'period': "2023/March"}, log_path=str(log_path))
+    profiler.write_log(profile, log_path=str(log_path))
+    entries = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert len(entries) == 2
+    assert entries[0]['context'] == {'period': "2023/March"}
+    assert entries[0]['steps'][0]['step'] == "agregasi"
+
+
+def test_profile_records_steps_from_worker_threads(sales, monkeypatch):
+    monkeypatch.setattr(dashboard, "CHART_WORKERS", 4)
+    df_filtered, _ = dashboard.filter_data_by_period(sales, "2023", "All Months")
+    profile = profiler.start_profile()
+
+    dashboard.build_charts(list(dashboard.CHARTS), df_filtered, "2023", "All Months", profile=profile)
+
+    steps = {record['step'] for record in profile['steps']}
+    threads = {record['thread'] for record in profile['steps']}
+    assert {f"{chart_id}: total" for chart_id in dashboard.CHARTS} <= steps
+    assert all(thread.startswith("chart") for thread in threads)
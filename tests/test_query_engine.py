@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+import dashboard
+import data_store
+import query_engine
+
+pytestmark = pytest.mark.skipif(not query_engine.is_available(), reason="DuckDB tidak terpasang")
+
+
+# Fungsi untuk menyiapkan snapshot dataset sintetis dan koneksi DuckDB-nya
+def open_engine(sales, version):
+    data_store.write_snapshot(sales, version)
+    return query_engine.get_connection(version)
+
+
+def test_old_connection_stays_usable_after_newer_versions(sales, store_dir):
+    old_engine = open_engine(sales, "qe-v1")
+    for version in ("qe-v2", "qe-v3"):
+        open_engine(sales, version)
+
+    # qe-v1 sudah keluar dari cache, tetapi sesi yang masih memegangnya tetap bisa query
+    assert "qe-v1" not in query_engine._connections
+    rows = query_engine.run_query(old_engine, "SELECT COUNT(*) AS n FROM sales")['n'].iloc[0]
+    assert rows == len(sales)
+
+
+@pytest.mark.parametrize("chart_id", ['menu_performance', 'revenue_category', 'branch_performance', 'peak_hours'])
+def test_sql_aggregate_matches_pandas(sales, store_dir, chart_id):
+    engine = open_engine(sales, "qe-agg")
+    bounds = dashboard.get_filter_bounds("2023", "March")
+    df_filtered, _ = dashboard.filter_data_by_period(sales, "2023", "March")
+
+    expected = dashboard.get_chart_data(chart_id, df_filtered, "2023", "March")
+    actual = query_engine.aggregate(engine, chart_id, bounds, "2023", "March")
+
+    key = expected.columns[0]
+    expected = expected.astype({key: str}).sort_values(key, ignore_index=True)
+    actual = actual.astype({key: str}).sort_values(key, ignore_index=True)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
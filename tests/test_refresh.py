@@ -0,0 +1,82 @@
+import os
+
+import pandas as pd
+import plotly.io as pio
+
+import dashboard
+import data_store
+import prerender
+import refresh
+import traffic
+
+
+def test_prerender_round_trip(sales, store_dir):
+    df = sales.copy(deep=False)
+    df.attrs['snapshot_version'] = "v1"
+    periods = dashboard.render_default_periods(df)
+    prerender.save_prerender("v1", periods, store_dir)
+    loaded = prerender.load_prerender("v1", store_dir)
+
+    assert loaded.keys() == periods.keys()
+    for key, rendered in periods.items():
+        assert loaded[key]['kpis']['top_menu'] == rendered['kpis']['top_menu']
+        assert loaded[key]['kpis']['total_revenue'] == rendered['kpis']['total_revenue']
+        for chart_id, figure in rendered['charts'].items():
+            stored = pio.to_json(figure, validate=False)
+            assert loaded[key]['payload_bytes'][chart_id] == len(stored)
+            reloaded = loaded[key]['charts'][chart_id]
+            assert [(trace.type, trace.name) for trace in reloaded.data] == [(trace.type, trace.name) for trace in figure.data]
+        data = rendered['data']['menu_performance'].astype({'product_detail': str}).reset_index(drop=True)
+        pd.testing.assert_frame_equal(loaded[key]['data']['menu_performance'], data, check_dtype=False)
+
+    assert prerender.load_prerender("v2", store_dir) is None
+
+
+def test_etl_and_dashboard_requests_build_the_version_once(warehouse, store_dir, monkeypatch):
+    builds = []
+    original_build = dashboard.build_dataset
+
+    def spy_build(engine):
+        builds.append(True)
+        return original_build(engine)
+
+    monkeypatch.setattr(dashboard, "build_dataset", spy_build)
+    version = refresh.latest_version(warehouse)
+
+    # ETL meminta pre-render, lalu sesi dashboard meminta refresh versi yang sama
+    refresh.start_refresh(warehouse, render=True)
+    refresh.start_refresh(warehouse, version)
+    refresh.wait()
+
+    status = refresh.get_status()
+    assert status == {'running': False, 'version': version, 'error': None}
+    assert len(builds) == 1
+    assert data_store.has_snapshot(version)
+    assert traffic.load_cube(version) is not None
+    assert os.path.exists(prerender.prerender_path(version))
+
+
+def test_failed_version_is_not_retried_until_the_backoff_expires(monkeypatch):
+    calls = []
+
+    def prepare_version(engine, version=None, render=False):
+        calls.append(version)
+        raise RuntimeError("database down")
+
+    monkeypatch.setattr(refresh, "prepare_version", prepare_version)
+    monkeypatch.setitem(refresh._state, 'failed', None)
+    monkeypatch.setitem(refresh._state, 'error', None)
+
+    assert refresh.start_refresh(None, "v1")
+    refresh.wait()
+    # Rerun dashboard berikutnya untuk versi yang sama tidak membangun ulang
+    assert not refresh.start_refresh(None, "v1")
+    assert refresh.get_status()['error'] == "database down"
+
+    # Versi baru dicoba langsung, versi yang gagal dicoba lagi setelah jeda habis
+    assert refresh.start_refresh(None, "v2")
+    refresh.wait()
+    monkeypatch.setattr(refresh, "REFRESH_RETRY_SECONDS", 0)
+    assert refresh.start_refresh(None, "v2")
+    refresh.wait()
+    assert calls == ["v1", "v2", "v2"]
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+import dashboard
+import sketches
+
+PERIODS = [("2023", "February"), ("2023", "March"), ("2023", "All Months")]
+
+
+@pytest.fixture(scope="module")
+def sketch_store(sales):
+    return sketches.build_sketch_store(sales)
+
+
+def test_sketch_store_is_smaller_than_the_dataset(sales, sketch_store):
+    assert sketches.store_bytes(sketch_store) < sales.memory_usage(deep=True).sum() / 2
+
+
+def test_sparse_hll_merge_equals_one_dense_sketch(sales):
+    ids = sales['transaction_id'].to_numpy()
+    cells = np.arange(len(ids)) % 50
+    per_cell = sketches.hll_build(ids, cells, 50)
+    single = sketches.hll_build(ids, np.zeros(len(ids), dtype=np.int64), 1)
+
+    assert np.array_equal(sketches.hll_merge(per_cell, np.arange(50)), sketches.hll_merge(single, [0]))
+
+
+@pytest.mark.parametrize("selected_year, selected_month", PERIODS)
+def test_hll_error_stays_within_bounds(sales, sketch_store, selected_year, selected_month):
+    bounds = dashboard.get_period_bounds(selected_year, selected_month)
+    df_filtered, _ = dashboard.filter_data_by_period(sales, selected_year, selected_month)
+    day_slice, store_idx = sketches.select_cells(sketch_store, bounds[0], bounds[1])
+
+    exact = df_filtered['transaction_id'].nunique()
+    estimate = sketches.approx_distinct(sketch_store, day_slice, store_idx)
+    assert abs(estimate - exact) <= sketches.hll_error() * exact
+
+
+def test_top_products_are_lower_bounds_within_the_floor(sales):
+    # K kecil agar sebagian produk tidak tersimpan di setiap sel
+    n_products = len(sales['product_detail'].cat.categories)
+    cells = sales['transaction_date'].dt.day.to_numpy().astype(np.int64)
+    product_codes = sales['product_detail'].cat.codes.to_numpy().astype(np.int64)
+    qty = sales['transaction_qty'].to_numpy(dtype=np.float64)
+    top = sketches.top_products_build(product_codes, qty, sales['total_bill'].to_numpy(), cells, 32, n_products, k=3)
+
+    estimate, _, error = sketches.top_products_merge(top, np.arange(32), n_products)
+    exact = np.bincount(product_codes, weights=qty, minlength=n_products)
+    assert error > 0
+    assert (estimate <= exact).all()
+    assert (exact - estimate <= error).all()
+
+
+def test_approx_top_menu_matches_exact_counts(sales, sketch_store):
+    bounds = dashboard.get_period_bounds("2023", "March")
+    df_filtered, _ = dashboard.filter_data_by_period(sales, "2023", "March")
+    summary = sketches.summarize_period(sketch_store, bounds)
+
+    exact = df_filtered.groupby('product_detail', observed=True)['transaction_qty'].sum()
+    assert exact[summary['top_menu']] - summary['approx']['menu_qty_error'] <= summary['top_menu_qty'] <= exact[summary['top_menu']]
+    assert summary['total_revenue'] == pytest.approx(df_filtered['total_bill'].sum())
+
+
+def test_vectorized_tdigest_equals_per_cell_compress(sales):
+    values = sales['total_bill'].to_numpy()
+    cells = sales['transaction_date'].dt.month.to_numpy().astype(np.int64)
+    digest = sketches.tdigest_build(values, cells, 13)
+
+    for cell in range(13):
+        means, weights = sketches.tdigest_compress(values[cells == cell], np.ones(int((cells == cell).sum())))
+        lo, hi = digest['offsets'][cell], digest['offsets'][cell + 1]
+        np.testing.assert_allclose(digest['means'][lo:hi], means, rtol=1e-6)
+        np.testing.assert_array_equal(digest['weights'][lo:hi], weights)
+
+
+def test_ticket_quantiles_stay_within_rank_error(sales, sketch_store):
+    bounds = dashboard.get_period_bounds("2023", "All Months")
+    day_slice, store_idx = sketches.select_cells(sketch_store, bounds[0], bounds[1])
+    quantiles = sketches.approx_ticket_quantiles(sketch_store, day_slice, store_idx)
+
+    tickets = sales.groupby('transaction_id')['total_bill'].sum()
+    for q, value in quantiles.items():
+        rank = (tickets <= value).mean() * 100
+        assert abs(rank - q * 100) <= sketches.tdigest_error(q) + 1
+
+
+def test_aggregate_trend_and_branch_use_merged_cells(sales, sketch_store):
+    bounds = dashboard.get_period_bounds("2023", "March")
+    df_filtered, _ = dashboard.filter_data_by_period(sales, "2023", "March")
+
+    trend = sketches.aggregate(sketch_store, 'sales_trend', bounds, "2023", "March")
+    assert len(trend) == 31
+    assert trend['total_bill'].sum() == pytest.approx(df_filtered['total_bill'].sum())
+
+    branch = sketches.aggregate(sketch_store, 'revenue_customer_branch', bounds, "2023", "March")
+    exact = df_filtered.groupby('store_location', observed=True)['transaction_id'].nunique()
+    for row in branch.itertuples():
+        assert abs(row.Customers - exact[row.Branch]) <= sketches.hll_error() * exact[row.Branch]
+    revenue = df_filtered.groupby('store_location', observed=True)['total_bill'].sum()
+    assert dict(zip(branch['Branch'], branch['Revenue'])) == pytest.approx(revenue.to_dict())
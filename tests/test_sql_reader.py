@@ -0,0 +1,112 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+import dashboard
+import sql_reader
+
+# Puncak alokasi diukur dengan semantik salin pandas 2.x (requirements.txt);
+# copy-on-write pandas 3 mengubah kapan penggantian kolom menyalin buffer
+PANDAS_2 = int(pd.__version__.split(".")[0]) < 3
+
+
+# Fungsi untuk membuat tabel SQLite kecil dengan NULL di beberapa kolom
+def make_engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER, hour INTEGER, store TEXT, bill REAL, day TEXT)"))
+        rows = [
+            {'id': i, 'hour': None if i % 7 == 0 else i % 24, 'store': None if i % 11 == 0 else ["b", "a", "c"][i % 3],
+             'bill': i * 1.5, 'day': f"2023-01-{i % 28 + 1:02d} 08:00:00"}
+            for i in range(1, 1001)
+        ]
+        conn.execute(text("INSERT INTO t VALUES (:id, :hour, :store, :bill, :day)"), rows)
+    return engine
+
+
+def test_streamed_read_matches_read_sql():
+    engine = make_engine()
+    kinds = {'id': 'int64', 'hour': 'Int8', 'store': 'category', 'bill': 'float', 'day': 'datetime'}
+    with engine.connect() as conn:
+        # Perkiraan jumlah baris sengaja terlalu kecil agar buffer harus diperbesar
+        df = sql_reader.read_sql_compact(conn, "SELECT * FROM t", column_kinds=kinds, expected_rows=10, chunk_size=64)
+        expected = pd.read_sql(text("SELECT * FROM t"), conn)
+
+    assert len(df) == 1000
+    assert df['id'].dtype == np.int64
+    assert str(df['hour'].dtype) == 'Int8'
+    assert df['hour'].isna().sum() == expected['hour'].isna().sum()
+    assert list(df['store'].cat.categories) == ["a", "b", "c"]
+    assert df['store'].isna().tolist() == expected['store'].isna().tolist()
+    assert df['store'].dropna().astype(str).tolist() == expected['store'].dropna().astype(str).tolist()
+    pd.testing.assert_series_equal(df['bill'], expected['bill'])
+    assert df['day'].dtype == 'datetime64[ns]'
+    pd.testing.assert_series_equal(df['day'], pd.to_datetime(expected['day']).astype('datetime64[ns]'))
+    assert df.attrs['raw_bytes_per_row'] > 0
+
+
+def test_rows_are_written_chunk_by_chunk(monkeypatch):
+    engine = make_engine()
+    written = []
+    write_chunk = sql_reader._write_chunk
+
+    def record_chunk(buffer, values, start):
+        if buffer['kind'] == 'int64':
+            written.append((start, len(values)))
+        write_chunk(buffer, values, start)
+
+    monkeypatch.setattr(sql_reader, "_write_chunk", record_chunk)
+    with engine.connect() as conn:
+        df = sql_reader.read_sql_compact(conn, "SELECT * FROM t", column_kinds={'id': 'int64'}, expected_rows=10, chunk_size=64)
+
+    # Setiap chunk ditulis ke posisinya sendiri, tidak ada satu buffer hasil penuh
+    assert written == [(start, min(64, 1000 - start)) for start in range(0, 1000, 64)]
+    assert df['id'].tolist() == list(range(1, 1001))
+
+
+def test_sort_by_date_matches_stable_sort_values(sales):
+    shuffled = sales.sample(frac=1, random_state=0).reset_index(drop=True)
+    expected = shuffled.sort_values('transaction_date', kind='mergesort', ignore_index=True)
+
+    result = dashboard.sort_by_date(shuffled.copy())
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.skipif(not PANDAS_2, reason="batas alokasi berlaku untuk semantik salin pandas 2.x")
+def test_sort_by_date_and_compact_do_not_copy_the_whole_frame(sales):
+    # Fungsi untuk mengukur puncak memori tambahan selama fn berjalan
+    def extra_peak(fn):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        return tracemalloc.get_traced_memory()[1] - current
+
+    tracemalloc.start()
+    try:
+        # Satu array per kolom tanpa konsolidasi blok, seperti hasil read_sql_compact
+        order = np.random.default_rng(0).permutation(len(sales))
+        shuffled = pd.DataFrame({col: sales[col].array.take(order) for col in sales.columns}, copy=False)
+        frame_bytes = shuffled.memory_usage(index=False).sum()
+        sort_extra = extra_peak(lambda: dashboard.sort_by_date(shuffled))
+        compact_extra = extra_peak(lambda: dashboard.compact_dataset(shuffled))
+    finally:
+        tracemalloc.stop()
+
+    # Beberapa kolom ditambah array urutan, jauh di bawah salinan penuh
+    assert shuffled['transaction_date'].is_monotonic_increasing
+    assert sort_extra < frame_bytes / 2
+    assert compact_extra < frame_bytes / 2
+
+
+def test_compact_keeps_existing_compact_columns(sales):
+    df = sales.copy(deep=False)
+    dtypes = df.dtypes.to_dict()
+    compact = dashboard.compact_dataset(df)
+
+    assert compact is df
+    for col in ['store_location', 'product_detail', 'transaction_date']:
+        assert compact[col].dtype == dtypes[col]
+        pd.testing.assert_series_equal(compact[col], sales[col])
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import traffic
+
+
+# Fungsi untuk membandingkan dua traffic cube
+def assert_cubes_equal(actual, expected):
+    assert np.array_equal(actual['days'], expected['days'])
+    assert np.array_equal(actual['stores'], expected['stores'])
+    assert np.array_equal(actual['qty'], expected['qty'])
+    assert np.array_equal(actual['transactions'], expected['transactions'])
+    assert actual['rows'] == expected['rows']
+    assert actual['max_transaction_id'] == expected['max_transaction_id']
+
+
+# Dataset dengan transaction_id unik dan naik sesuai urutan baris (pola append ETL)
+@pytest.fixture(scope="module")
+def sales_by_id(sales):
+    df = sales.copy()
+    df['transaction_id'] = np.arange(1, len(df) + 1, dtype=np.int64)
+    return df
+
+
+def test_cube_update_equals_rebuild(sales_by_id):
+    cutoff = len(sales_by_id) * 3 // 4
+    base = traffic.build_traffic_cube(sales_by_id.iloc[:cutoff])
+
+    updated = traffic.update_traffic_cube(base, sales_by_id)
+    assert_cubes_equal(updated, traffic.build_traffic_cube(sales_by_id))
+
+
+def test_cube_is_rebuilt_when_rows_were_deleted(sales_by_id):
+    base = traffic.build_traffic_cube(sales_by_id)
+    remaining = sales_by_id.iloc[100:]
+
+    assert_cubes_equal(traffic.update_traffic_cube(base, remaining), traffic.build_traffic_cube(remaining))
+
+
+def test_rollup_matches_rows(sales_by_id):
+    cube = traffic.build_traffic_cube(sales_by_id)
+    grid = traffic.rollup(cube, "2023-02-01", "2023-03-01", stores=["Astoria"], average=False)
+
+    rows = sales_by_id[
+        (sales_by_id['transaction_date'] >= "2023-02-01") & (sales_by_id['transaction_date'] < "2023-03-01")
+        & (sales_by_id['store_location'] == "Astoria")
+    ]
+    expected = rows.groupby([rows['transaction_date'].dt.dayofweek, rows['hour'].astype(int)])['transaction_qty'].sum()
+    for (weekday, hour), qty in expected.items():
+        assert grid.iloc[weekday, hour] == qty
+    assert grid.to_numpy().sum() == rows['transaction_qty'].sum()
+
+
+def test_ensure_cube_saves_once_and_updates_from_latest(sales_by_id, store_dir):
+    cutoff = len(sales_by_id) // 2
+    first = traffic.ensure_cube("v1", sales_by_id.iloc[:cutoff], store_dir)
+    assert traffic.load_cube("v1", store_dir) is not None
+
+    # Versi berikutnya diperbarui dari cube v1 di disk
+    second = traffic.ensure_cube("v2", sales_by_id, store_dir)
+    assert_cubes_equal(second, traffic.build_traffic_cube(sales_by_id))
+    assert_cubes_equal(traffic.ensure_cube("v1", sales_by_id, store_dir), first)
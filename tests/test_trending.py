@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dashboard
+import trending
+
+
+def test_momentum_equals_groupby_over_both_windows(sales):
+    series = trending.build_daily_series(sales)
+    day = trending.anchor_day(series, pd.Timestamp("2023-04-01"))
+    momentum = trending.compute_momentum(series, day, window=14).set_index('product_detail')
+
+    dates = sales['transaction_date'].dt.normalize()
+    end = pd.Timestamp(day) + pd.Timedelta(days=1)
+    recent = sales[(dates >= end - pd.Timedelta(days=14)) & (dates < end)]
+    prior = sales[(dates >= end - pd.Timedelta(days=28)) & (dates < end - pd.Timedelta(days=14))]
+    for product, qty in recent.groupby('product_detail', observed=True)['transaction_qty'].sum().items():
+        assert momentum.loc[product, 'recent_qty'] == qty
+    for product, qty in prior.groupby('product_detail', observed=True)['transaction_qty'].sum().items():
+        assert momentum.loc[product, 'prior_qty'] == qty
+
+
+def test_store_series_is_built_once_per_version(sales, monkeypatch):
+    builds = []
+    build_daily_series = trending.build_daily_series
+    monkeypatch.setattr(trending, "build_daily_series", lambda df: builds.append(len(df)) or build_daily_series(df))
+    cache = dashboard.new_figure_cache()
+    filters = {'store_location': ["Astoria", "Lower Manhattan"]}
+
+    day, momentum = dashboard.get_trending_momentum(sales, "2023", "March", filters, data_version="v1", cache=cache)
+    for selected_month in ("February", "April"):
+        dashboard.get_trending_momentum(sales, "2023", selected_month, {'store_location': ["Lower Manhattan", "Astoria"]}, data_version="v1", cache=cache)
+    assert len(builds) == 1
+
+    rows = sales[sales['store_location'].isin(filters['store_location'])]
+    assert builds == [len(rows)]
+    expected = trending.compute_momentum(build_daily_series(rows), day)
+    pd.testing.assert_frame_equal(momentum, expected)
+
+
+def test_short_history_has_no_anchor_day(sales):
+    day, momentum = dashboard.get_trending_momentum(sales, "2023", "January", window=28)
+    assert day is None and momentum.empty
+
+
+def test_threshold_leaves_no_rising_item(sales):
+    series = trending.build_daily_series(sales)
+    day = trending.anchor_day(series)
+    momentum = trending.compute_momentum(series, day, min_momentum=np.inf)
+
+    assert not momentum.empty
+    assert trending.top_trending(momentum).empty
+
+
+def test_series_cache_size_counts_array_bytes(sales):
+    series = trending.build_daily_series(sales)
+    assert dashboard.estimate_cache_size(series) >= series['cumulative'].nbytes
+    assert dashboard.estimate_cache_size(series) == pytest.approx(series['cumulative'].nbytes, rel=0.5)
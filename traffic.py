@@ -0,0 +1,195 @@
+import os
+import glob
+import numpy as np
+import pandas as pd
+
+import data_store
+
+# Nama hari (urutan dayofweek pandas: Senin = 0)
+WEEKDAY_NAMES = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+HOURS = 24
+KEEP_CUBES = 2
+
+# Fungsi untuk mendapatkan path file traffic cube dari sebuah versi data
+def cube_path(version, store_dir=data_store.STORE_DIR):
+    safe_version = str(version).replace(os.sep, "_").replace(":", "_")
+    return os.path.join(store_dir, f"traffic-{safe_version}.npz")
+
+# Fungsi untuk membangun traffic cube (hari, toko, jam) dari dataset
+def build_traffic_cube(df):
+    """
+    Menghitung qty dan jumlah transaksi untuk setiap sel (hari, toko, jam).
+    Cube berukuran hari x toko x 24 sehingga heatmap jam x hari untuk
+    periode dan toko apa pun cukup dijumlahkan dari cube tanpa membaca baris
+    mentah. Transaksi dihitung unik per sel; transaksi yang (jarang) melewati
+    batas jam terhitung di setiap jam yang dilewatinya.
+    """
+    if df is None or df.empty:
+        return empty_cube()
+
+    dates = df['transaction_date'].to_numpy()
+    hours = df['hour'].to_numpy(dtype=np.float64, na_value=np.nan)
+    store_codes = df['store_location'].cat.codes.to_numpy().astype(np.int64)
+    valid = ~np.isnat(dates) & ~np.isnan(hours) & (store_codes >= 0)
+
+    day_codes, days = pd.factorize(dates[valid].astype('datetime64[D]'), sort=True)
+    stores = df['store_location'].cat.categories
+    n_days, n_stores = len(days), len(stores)
+    cells = (day_codes.astype(np.int64) * n_stores + store_codes[valid]) * HOURS + hours[valid].astype(np.int64)
+    n_cells = n_days * n_stores * HOURS
+
+    qty = np.bincount(cells, weights=df['transaction_qty'].to_numpy(dtype=np.float64)[valid], minlength=n_cells)
+    pairs = pd.DataFrame({'cell': cells, 'transaction_id': df['transaction_id'].to_numpy()[valid]}).drop_duplicates()
+    transactions = np.bincount(pairs['cell'].to_numpy(), minlength=n_cells)
+
+    transaction_ids = df['transaction_id'].to_numpy()
+    return {
+        'days': np.asarray(days, dtype='datetime64[D]'),
+        'stores': np.asarray(stores, dtype=str),
+        'qty': qty.astype(np.int32).reshape(n_days, n_stores, HOURS),
+        'transactions': transactions.astype(np.int32).reshape(n_days, n_stores, HOURS),
+        'rows': len(df),
+        'max_transaction_id': int(transaction_ids.max()) if len(transaction_ids) else 0
+    }
+
+# Fungsi untuk membuat traffic cube kosong
+def empty_cube():
+    return {
+        'days': np.array([], dtype='datetime64[D]'),
+        'stores': np.array([], dtype=str),
+        'qty': np.zeros((0, 0, HOURS), dtype=np.int32),
+        'transactions': np.zeros((0, 0, HOURS), dtype=np.int32),
+        'rows': 0,
+        'max_transaction_id': 0
+    }
+
+# Fungsi untuk menggabungkan dua traffic cube (mis. cube lama + baris baru dari ETL)
+def merge_cubes(base, delta):
+    days = np.union1d(base['days'], delta['days'])
+    stores = np.union1d(base['stores'], delta['stores'])
+    shape = (len(days), len(stores), HOURS)
+
+    merged = {'days': days, 'stores': stores, 'rows': base['rows'] + delta['rows']}
+    merged['max_transaction_id'] = max(base['max_transaction_id'], delta['max_transaction_id'])
+    for name in ('qty', 'transactions'):
+        values = np.zeros(shape, dtype=np.int32)
+        for cube in (base, delta):
+            day_idx = np.searchsorted(days, cube['days'])
+            store_idx = np.searchsorted(stores, cube['stores'])
+            values[np.ix_(day_idx, store_idx)] += cube[name]
+        merged[name] = values
+    return merged
+
+# Fungsi untuk memperbarui traffic cube lama dengan dataset versi terbaru
+def update_traffic_cube(base, df):
+    """
+    Jika dataset baru hanya berisi tambahan baris di atas watermark cube lama
+    (pola load ETL append), hanya baris baru yang dijumlahkan ke cube lama.
+    Selain itu (update, delete, atau belum ada cube) cube dibangun ulang.
+    """
+    if base is None or base['rows'] == 0 or df is None or df.empty:
+        return build_traffic_cube(df)
+
+    is_new = df['transaction_id'].to_numpy() > base['max_transaction_id']
+    if len(df) - int(is_new.sum()) != base['rows']:
+        return build_traffic_cube(df)
+    if not is_new.any():
+        return base
+    return merge_cubes(base, build_traffic_cube(df[is_new]))
+
+# Fungsi untuk menyimpan traffic cube sebuah versi data ke disk
+def save_cube(cube, version, store_dir=data_store.STORE_DIR):
+    os.makedirs(store_dir, exist_ok=True)
+
+    def write_cube(path):
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                days=cube['days'].astype(np.int64),
+                stores=cube['stores'],
+                qty=cube['qty'],
+                transactions=cube['transactions'],
+                watermark=np.array([cube['rows'], cube['max_transaction_id']], dtype=np.int64)
+            )
+
+    data_store._atomic_write(cube_path(version, store_dir), write_cube)
+    cleanup_cubes(store_dir)
+
+# Fungsi untuk membaca traffic cube sebuah versi, membangunnya dulu jika belum ada
+def ensure_cube(version, df, store_dir=data_store.STORE_DIR):
+    """
+    Cube versi baru dibuat dari cube terakhir di disk (update incremental)
+    atau dibangun ulang, paling banyak sekali per versi dalam satu proses.
+    """
+    cube = load_cube(version, store_dir)
+    if cube is not None:
+        return cube
+
+    with data_store.build_lock(("traffic", store_dir, version)):
+        cube = load_cube(version, store_dir)
+        if cube is None:
+            cube = update_traffic_cube(load_latest_cube(store_dir), df)
+            save_cube(cube, version, store_dir)
+    return cube
+
+# Fungsi untuk membaca traffic cube dari file
+def _read_cube(path):
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return {
+                'days': data['days'].astype('datetime64[D]'),
+                'stores': data['stores'],
+                'qty': data['qty'],
+                'transactions': data['transactions'],
+                'rows': int(data['watermark'][0]),
+                'max_transaction_id': int(data['watermark'][1])
+            }
+    except (OSError, KeyError, ValueError):
+        return None
+
+# Fungsi untuk membaca traffic cube sebuah versi data (None jika belum ada)
+def load_cube(version, store_dir=data_store.STORE_DIR):
+    path = cube_path(version, store_dir)
+    return _read_cube(path) if os.path.exists(path) else None
+
+# Fungsi untuk membaca traffic cube terakhir yang disimpan (dasar update incremental)
+def load_latest_cube(store_dir=data_store.STORE_DIR):
+    paths = sorted(glob.glob(os.path.join(store_dir, "traffic-*.npz")), key=os.path.getmtime, reverse=True)
+    return _read_cube(paths[0]) if paths else None
+
+# Fungsi untuk menghapus traffic cube lama
+def cleanup_cubes(store_dir=data_store.STORE_DIR, keep=KEEP_CUBES):
+    paths = sorted(glob.glob(os.path.join(store_dir, "traffic-*.npz")), key=os.path.getmtime, reverse=True)
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# Fungsi untuk merangkum traffic cube menjadi grid hari x jam
+def rollup(cube, start=None, end=None, stores=None, metric='qty', average=True):
+    """
+    Menjumlahkan cube untuk rentang tanggal [start, end) dan daftar toko
+    (None = semua toko) menjadi DataFrame 7 x 24 (Senin..Minggu x jam).
+    Jika average=True, nilai dibagi jumlah hari tersebut dalam rentang yang
+    memiliki data, sehingga hasilnya rata-rata per hari (untuk penjadwalan
+    staf). Hanya operasi penjumlahan array, sehingga cepat untuk periode
+    sepanjang apa pun.
+    """
+    days = cube['days']
+    lo = 0 if start is None else int(np.searchsorted(days, np.datetime64(pd.Timestamp(start), 'D')))
+    hi = len(days) if end is None else int(np.searchsorted(days, np.datetime64(pd.Timestamp(end), 'D')))
+
+    values = cube[metric][lo:hi]
+    if stores:
+        values = values[:, np.isin(cube['stores'], [str(store) for store in stores])]
+    daily = values.sum(axis=1, dtype=np.int64)
+
+    weekdays = pd.DatetimeIndex(days[lo:hi]).dayofweek.to_numpy()
+    grid = np.zeros((7, HOURS), dtype=np.float64)
+    np.add.at(grid, weekdays, daily)
+    if average:
+        day_counts = np.bincount(weekdays, minlength=7)
+        grid = grid / np.maximum(day_counts, 1)[:, None]
+
+    return pd.DataFrame(grid, index=WEEKDAY_NAMES, columns=range(HOURS))
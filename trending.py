@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+# Panjang jendela default (hari): jendela terakhir dibandingkan dengan jendela sebelumnya
+DEFAULT_WINDOW_DAYS = 7
+# Ambang signifikansi: total qty kedua jendela, skor z dan kenaikan relatif minimal
+MIN_WINDOW_QTY = 20
+MIN_Z_SCORE = 2.0
+MIN_MOMENTUM = 0.10
+MOMENTUM_COLUMNS = ['product_detail', 'product_category', 'recent_qty', 'prior_qty', 'momentum', 'z_score', 'rising']
+
+# Fungsi untuk membangun deret qty harian per produk dari dataset
+def build_daily_series(df):
+    """
+    Matriks qty hari x produk untuk setiap hari kalender dari transaksi
+    pertama sampai terakhir (hari tanpa penjualan bernilai 0), disimpan
+    sebagai prefix sum kumulatif. Jumlah qty semua produk pada jendela hari
+    mana pun cukup selisih dua baris matriks, tanpa groupby ulang.
+    """
+    products = df['product_detail'].cat.categories
+    if df.empty:
+        return {
+            'start': None,
+            'products': np.asarray(products, dtype=str),
+            'categories': np.full(len(products), "", dtype=object),
+            'cumulative': np.zeros((1, len(products)), dtype=np.int64)
+        }
+
+    dates = df['transaction_date'].to_numpy().astype('datetime64[D]')
+    product_codes = df['product_detail'].cat.codes.to_numpy().astype(np.int64)
+    valid = ~np.isnat(dates) & (product_codes >= 0)
+    start = dates[valid].min()
+    day_idx = (dates[valid] - start).astype(np.int64)
+    n_days, n_products = int(day_idx.max()) + 1, len(products)
+
+    qty = np.bincount(
+        day_idx * n_products + product_codes[valid],
+        weights=df['transaction_qty'].to_numpy(dtype=np.float64)[valid],
+        minlength=n_days * n_products
+    ).reshape(n_days, n_products)
+    cumulative = np.zeros((n_days + 1, n_products), dtype=np.int64)
+    np.cumsum(np.rint(qty).astype(np.int64), axis=0, out=cumulative[1:])
+
+    # Kategori setiap produk (diambil dari baris pertama produk tersebut)
+    categories = np.full(n_products, "", dtype=object)
+    codes, first_rows = np.unique(product_codes[valid], return_index=True)
+    categories[codes] = df['product_category'].to_numpy()[valid][first_rows].astype(str)
+
+    return {
+        'start': start,
+        'products': np.asarray(products, dtype=str),
+        'categories': categories,
+        'cumulative': cumulative
+    }
+
+# Fungsi untuk menentukan hari acuan trending (hari terakhir periode yang ada datanya)
+def anchor_day(series, end=None):
+    """
+    end adalah batas akhir periode (eksklusif, mis. dari get_filter_bounds)
+    atau None untuk All Time. Mengembalikan numpy datetime64[D] atau None
+    jika periode berakhir sebelum data pertama.
+    """
+    if series['start'] is None:
+        return None
+    last_day = series['start'] + np.timedelta64(len(series['cumulative']) - 2, 'D')
+    if end is None:
+        return last_day
+    day = np.datetime64(pd.Timestamp(end).date(), 'D') - np.timedelta64(1, 'D')
+    return min(day, last_day) if day >= series['start'] else None
+
+# Fungsi untuk mengecek apakah histori sampai `day` cukup untuk dua jendela
+def has_history(series, day, window=DEFAULT_WINDOW_DAYS):
+    if day is None or series['start'] is None:
+        return False
+    return int((day - series['start']).astype(np.int64)) + 1 >= 2 * window
+
+# Fungsi untuk menghitung momentum semua produk sekaligus
+def compute_momentum(series, day, window=DEFAULT_WINDOW_DAYS, categories=None, products=None,
+                     min_qty=MIN_WINDOW_QTY, min_z=MIN_Z_SCORE, min_momentum=MIN_MOMENTUM):
+    """
+    Membandingkan qty `window` hari terakhir sampai `day` (inklusif) dengan
+    `window` hari sebelumnya untuk semua produk dalam satu operasi vektor.
+    momentum adalah perubahan relatif (0.35 = naik 35%); z_score adalah
+    (recent - prior) / sqrt(recent + prior), uji selisih dua hitungan Poisson,
+    sehingga produk kecil yang naik dari 1 ke 3 cup tidak dianggap trending.
+    rising = total qty kedua jendela >= min_qty, z_score >= min_z dan
+    momentum >= min_momentum (produk laris yang naik 2% tetap tidak trending).
+    Mengembalikan DataFrame kosong jika histori sebelum `day` kurang dari dua
+    jendela. Hasil diurutkan berdasarkan z_score.
+    """
+    if not has_history(series, day, window):
+        return pd.DataFrame(columns=MOMENTUM_COLUMNS)
+    end = int((day - series['start']).astype(np.int64)) + 1
+
+    cumulative = series['cumulative']
+    recent = cumulative[end] - cumulative[end - window]
+    prior = cumulative[end - window] - cumulative[end - 2 * window]
+
+    keep = np.ones(len(series['products']), dtype=bool)
+    if categories:
+        keep &= np.isin(series['categories'], list(categories))
+    if products:
+        keep &= np.isin(series['products'], list(products))
+    keep &= (recent + prior) > 0
+
+    recent, prior = recent[keep], prior[keep]
+    momentum = (recent - prior) / np.maximum(prior, 1)
+    z_score = (recent - prior) / np.sqrt(np.maximum(recent + prior, 1))
+    result = pd.DataFrame({
+        'product_detail': series['products'][keep],
+        'product_category': series['categories'][keep],
+        'recent_qty': recent,
+        'prior_qty': prior,
+        'momentum': momentum,
+        'z_score': z_score,
+        'rising': (recent + prior >= min_qty) & (z_score >= min_z) & (momentum >= min_momentum)
+    })
+    return result.sort_values(['z_score', 'recent_qty'], ascending=False, ignore_index=True)
+
+# Fungsi untuk mengambil produk yang naik signifikan
+def top_trending(momentum, n=6):
+    return momentum[momentum['rising'].astype(bool)].head(n)